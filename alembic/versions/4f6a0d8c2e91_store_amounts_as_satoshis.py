@@ -0,0 +1,94 @@
+"""Store amounts as satoshis
+
+Revision ID: 4f6a0d8c2e91
+Revises: b2d94f0e6a17
+Create Date: 2026-10-18 21:34:56.208417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f6a0d8c2e91'
+down_revision: Union[str, None] = 'b2d94f0e6a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+amount_columns = {
+    'service_outputs': 'amount',
+    'service_inputs': 'amount',
+    'service_mempool_outputs': 'amount',
+    'service_address_balances': 'balance',
+}
+
+
+def upgrade() -> None:
+    for table, column in amount_columns.items():
+        op.alter_column(
+            table,
+            column,
+            type_=sa.BigInteger(),
+            postgresql_using=f"round({column} * 100000000)::bigint",
+        )
+
+    # JSONB amounts were stored as float coins
+    op.execute(
+        """
+        UPDATE service_transactions SET amount = coalesce((
+            SELECT jsonb_object_agg(
+                key, round(value::text::numeric * 100000000)::bigint
+            )
+            FROM jsonb_each(amount)
+        ), '{}')
+        """
+    )
+    op.execute(
+        """
+        UPDATE service_blocks SET movements = coalesce((
+            SELECT jsonb_object_agg(currency, (
+                SELECT jsonb_object_agg(
+                    address, round(value::text::numeric * 100000000)::bigint
+                )
+                FROM jsonb_each(addresses) AS movement(address, value)
+            ))
+            FROM jsonb_each(movements) AS currencies(currency, addresses)
+        ), '{}')
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        UPDATE service_blocks SET movements = coalesce((
+            SELECT jsonb_object_agg(currency, (
+                SELECT jsonb_object_agg(
+                    address, (value::text::numeric / 100000000)::float8
+                )
+                FROM jsonb_each(addresses) AS movement(address, value)
+            ))
+            FROM jsonb_each(movements) AS currencies(currency, addresses)
+        ), '{}')
+        """
+    )
+    op.execute(
+        """
+        UPDATE service_transactions SET amount = coalesce((
+            SELECT jsonb_object_agg(
+                key, (value::text::numeric / 100000000)::float8
+            )
+            FROM jsonb_each(amount)
+        ), '{}')
+        """
+    )
+
+    for table, column in amount_columns.items():
+        op.alter_column(
+            table,
+            column,
+            type_=sa.Numeric(precision=28, scale=8),
+            postgresql_using=f"{column}::numeric / 100000000",
+        )
@@ -0,0 +1,79 @@
+"""Store hashes as bytes
+
+Every column is converted in place with ALTER ... USING, which rewrites
+service_outputs, service_inputs, service_transactions and the other chain
+tables under an ACCESS EXCLUSIVE lock. API and sync have to be stopped for
+the whole upgrade, expect downtime proportional to the size of the tables.
+
+Revision ID: b2d94f0e6a17
+Revises: e7a1c39b5f20
+Create Date: 2026-10-18 20:58:12.340719
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d94f0e6a17'
+down_revision: Union[str, None] = 'e7a1c39b5f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+hex_columns = {
+    'service_blocks': ['blockhash', 'prev_blockhash'],
+    'service_transactions': ['txid', 'blockhash'],
+    'service_outputs': ['blockhash', 'txid', 'script'],
+    'service_inputs': ['blockhash', 'txid', 'source_txid'],
+    'service_address_transactions': ['txid', 'blockhash'],
+}
+
+outpoint_tables = ['service_outputs', 'service_inputs']
+
+
+def upgrade() -> None:
+    # Every table is rewritten once, its indexes are rebuilt afterwards
+    for table, columns in hex_columns.items():
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                type_=sa.LargeBinary(),
+                postgresql_using=f"decode({column}, 'hex')",
+            )
+
+    # "txid:n" becomes 32 byte txid followed by 4 byte big-endian n
+    for table in outpoint_tables:
+        op.alter_column(
+            table,
+            'shortcut',
+            type_=sa.LargeBinary(),
+            postgresql_using=(
+                "decode(split_part(shortcut, ':', 1), 'hex')"
+                " || int4send(split_part(shortcut, ':', 2)::int)"
+            ),
+        )
+
+
+def downgrade() -> None:
+    for table in outpoint_tables:
+        op.alter_column(
+            table,
+            'shortcut',
+            type_=sa.String(length=70),
+            postgresql_using=(
+                "encode(substring(shortcut from 1 for 32), 'hex') || ':' ||"
+                " ('x' || encode(substring(shortcut from 33 for 4), 'hex'))::bit(32)::int"
+            ),
+        )
+
+    for table, columns in hex_columns.items():
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                type_=sa.String() if column == 'script' else sa.String(length=64),
+                postgresql_using=f"encode({column}, 'hex')",
+            )
@@ -1,9 +1,13 @@
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager, suppress
-from .database import sessionmanager
+from .database import sessionmanager, ensure_no_initial_sync
 import fastapi.openapi.utils as fu
 from .settings import get_settings
+from .cache import count_cache, response_cache
+from .tip import tipholder
+from .rpc import rpcclient
+from . import constants
 from fastapi import FastAPI
 from . import errors
 
@@ -12,16 +16,39 @@ def create_app(init_db: bool = True) -> FastAPI:
     settings = get_settings()
     lifespan = None
 
+    # Node connections are pooled and shared by every request
+    rpcclient.init(**settings.get("rpc", {}))
+
+    count_cache.init(settings.get("cache.counts", constants.DEFAULT_CACHE_COUNTS))
+
+    response_cache.init(
+        settings.get("cache.responses", constants.DEFAULT_CACHE_RESPONSES),
+        settings.get("cache.ttl", constants.DEFAULT_CACHE_TTL),
+    )
+
+    tipholder.init(settings.get("cache.tip_ttl", constants.DEFAULT_CACHE_TIP_TTL))
+
     # SQLAlchemy initialization process
     if init_db:
         sessionmanager.init(settings.database.endpoint)
 
         @asynccontextmanager
         async def lifespan(_: FastAPI):
+            await ensure_no_initial_sync()
+
+            # Sync notifies about new blocks, the tip is not polled
+            tipholder.start()
+
             yield
+            with suppress(Exception):
+                await tipholder.close()
+
             with suppress(Exception):
                 await sessionmanager.close()
 
+            with suppress(Exception):
+                await rpcclient.close()
+
     fu.validation_error_response_definition = (
         errors.ErrorResponse.model_json_schema()
     )
@@ -36,6 +63,9 @@ def create_app(init_db: bool = True) -> FastAPI:
         ],
     )
 
+    # Registered before CORS so cached responses still get CORS headers
+    app.middleware("http")(response_cache)
+
     app.add_middleware(
         CORSMiddleware,  # type: ignore
         allow_origins=settings.backend.origins,
@@ -1,7 +1,7 @@
-from app.utils import pagination, paginated_response
+from app.utils import pagination, paginated_response, cursor_response, to_satoshi
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import APIRouter, Depends
-from app.dependencies import get_page
+from app.dependencies import get_page, get_cursor
 from app.database import get_session
 from app.address import service
 
@@ -46,8 +46,13 @@ async def get_utxo(
 ):
     limit, offset = pagination(page)
 
-    total = await service.count_utxo(session, address, currency, amount)
-    items = await service.list_utxo(session, address, currency, amount, limit, offset)
+    # Requested amount is in coins, outputs are stored in satoshis
+    amount_satoshi = to_satoshi(amount)
+
+    total = await service.count_utxo(session, address, currency, amount_satoshi)
+    items = await service.list_utxo(
+        session, address, currency, amount_satoshi, limit, offset
+    )
 
     return paginated_response(items.all(), total, page, limit)
 
@@ -57,13 +62,14 @@ async def get_transactions(
     address: str,
     session: AsyncSession = Depends(get_session),
     page: int = Depends(get_page),
+    cursor: str | None = Depends(get_cursor),
 ):
     limit, offset = pagination(page)
 
     total = await service.count_transactions(session, address)
-    items = await service.list_transactions(session, address, limit, offset)
+    items = await service.list_transactions(session, address, limit, offset, cursor)
 
-    return paginated_response(items, total, page, limit)
+    return cursor_response(items, total, page, limit, service.transactions_key)
 
 
 @router.get(
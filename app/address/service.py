@@ -1,12 +1,18 @@
-from app.models import Output, Transaction, AddressBalance, Address, MemPool
+from app.models import Output, Transaction, AddressBalance, Address
+from app.models import AddressTransaction
+from app.models import MemPoolTransaction, MemPoolOutput
 from sqlalchemy import Select, select, func, ScalarResult
 from app.transactions.service import (
-    load_tx_details,
+    load_transactions_details,
     get_token_units,
-    load_mempool_tx_details,
+    load_mempool_transactions,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.blocks.service import get_latest_block
+from app.cache import count_cache
+from app.utils import keyset
+
+# Keyset pagination sort key
+transactions_key = [AddressTransaction.height, AddressTransaction.block_index]
 
 
 def unspent_outputs_filters(query: Select, address: str, currency) -> Select:
@@ -22,8 +28,10 @@ def unspent_outputs_filters(query: Select, address: str, currency) -> Select:
 async def count_unspent_outputs(
     session: AsyncSession, address: str, currency: str
 ) -> int:
-    return await session.scalar(
-        unspent_outputs_filters(select(func.count(Output.id)), address, currency)
+    return await count_cache.count(
+        session,
+        ("unspent_outputs", address, currency.lower()),
+        unspent_outputs_filters(select(func.count(Output.id)), address, currency),
     )
 
 
@@ -57,20 +65,22 @@ def utxo_cte(address: str, currency: str):
 
 
 async def count_utxo(
-    session: AsyncSession, address: str, currency: str, amount: float
+    session: AsyncSession, address: str, currency: str, amount: int
 ) -> int:
     cte = utxo_cte(address, currency)
     query = (
         select(func.count(1)).select_from(cte).where(cte.c.cumulative_amount < amount)
     )
-    return await session.scalar(query) or 0
+    return await count_cache.count(
+        session, ("utxo", address, currency, amount), query
+    )
 
 
 async def list_utxo(
     session: AsyncSession,
     address: str,
     currency: str,
-    amount: float,
+    amount: int,
     limit: int,
     offset: int,
 ):
@@ -85,35 +95,43 @@ async def list_utxo(
     return await session.execute(query)
 
 
-def transactions_filters(query: Select, address: str) -> Select:
-    query = query.filter(Transaction.addresses.contains([address]))
-
-    return query
-
-
 async def count_transactions(session: AsyncSession, address: str):
-    return await session.scalar(
-        transactions_filters(select(func.count(Transaction.id)), address)
+    return await count_cache.count(
+        session,
+        ("address_transactions", address),
+        select(func.count(AddressTransaction.id)).filter(
+            AddressTransaction.address == address
+        ),
     )
 
 
 async def list_transactions(
-    session: AsyncSession, address: str, limit: int, offset: int
+    session: AsyncSession,
+    address: str,
+    limit: int,
+    offset: int,
+    cursor: str | None = None,
 ) -> list[Transaction]:
-    latest_block = await get_latest_block(session)
-    transactions = []
-    for transaction in await session.scalars(
-        transactions_filters(
-            select(Transaction)
-            .order_by(Transaction.created.desc())
-            .limit(limit)
-            .offset(offset),
-            address,
+    transactions = (
+        await session.scalars(
+            keyset(
+                select(Transaction)
+                .join(
+                    AddressTransaction,
+                    AddressTransaction.txid == Transaction.txid,
+                )
+                .filter(AddressTransaction.address == address),
+                transactions_key,
+                cursor,
+                offset,
+            ).limit(limit + 1)
         )
-    ):
-        transactions.append(await load_tx_details(session, transaction, latest_block))
+    ).all()
 
-    return transactions
+    # Extra row only marks the next page, its details are not needed
+    await load_transactions_details(session, transactions[:limit])
+
+    return list(transactions)
 
 
 async def list_balances(session: AsyncSession, address: str) -> list[AddressBalance]:
@@ -131,13 +149,19 @@ async def list_balances(session: AsyncSession, address: str) -> list[AddressBala
 
 
 async def list_address_mempool_transactions(session: AsyncSession, address: str):
-    mempool = await session.scalar(select(MemPool).limit(1))
-
-    if mempool is None:
-        return []
-
-    return [
-        await load_mempool_tx_details(session, transaction, mempool.raw["outputs"])
-        for transaction in mempool.raw["transactions"]
-        if address in transaction["addresses"]
-    ]
+    return await load_mempool_transactions(
+        session,
+        (
+            await session.scalars(
+                select(MemPoolTransaction)
+                .filter(
+                    MemPoolTransaction.txid.in_(
+                        select(MemPoolOutput.txid).filter(
+                            MemPoolOutput.address == address
+                        )
+                    )
+                )
+                .order_by(MemPoolTransaction.created.desc())
+            )
+        ).all(),
+    )
@@ -2,6 +2,7 @@ from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_session
+from app.utils import is_hash
 from app.errors import Abort
 from . import service
 from ..models import Block
@@ -21,6 +22,9 @@ async def require_latest_block(
 async def require_block(
     hash_: str, session: AsyncSession = Depends(get_session)
 ) -> Block:
+    if not is_hash(hash_):
+        raise Abort("blocks", "not-found")
+
     block = await service.get_block_by_hash(session, hash_)
 
     if block is None:
@@ -3,10 +3,11 @@ from fastapi import APIRouter, Depends
 
 from .schemas import BlockPaginatedResponse, BlockResponse
 from app.schemas import TransactionPaginatedResponse
-from app.utils import pagination, paginated_response
+from app.utils import pagination, cursor_response, is_hash
 from .dependencies import require_latest_block, require_block
-from app.dependencies import get_page
+from app.dependencies import get_page, get_cursor
 from app.database import get_session
+from app.errors import Abort
 from app.models import Block
 from . import service
 
@@ -20,18 +21,21 @@ async def latest_block(block: Block = Depends(require_latest_block)):
 
 @router.get("/", response_model=BlockPaginatedResponse)
 async def get_blocks(
-    page: int = Depends(get_page), session: AsyncSession = Depends(get_session)
+    page: int = Depends(get_page),
+    cursor: str | None = Depends(get_cursor),
+    session: AsyncSession = Depends(get_session),
 ):
     limit, offset = pagination(page)
 
     total = await service.count_blocks(session)
-    blocks = await service.get_blocks(session, offset, limit)
+    blocks = await service.get_blocks(session, offset, limit, cursor)
 
-    return paginated_response(
+    return cursor_response(
         blocks.all(),
         total=total,
         page=page,
         limit=limit,
+        columns=service.blocks_key,
     )
 
 
@@ -46,18 +50,23 @@ async def get_block(block: Block = Depends(require_block)):
 async def get_block_transactions(
     hash_: str,
     page: int = Depends(get_page),
+    cursor: str | None = Depends(get_cursor),
     session: AsyncSession = Depends(get_session),
 ):
+    if not is_hash(hash_):
+        raise Abort("blocks", "not-found")
+
     limit, offset = pagination(page)
 
     total = await service.count_block_transactions(session, hash_)
     transactions = await service.get_block_transactions(
-        session, hash_, offset, limit
+        session, hash_, offset, limit, cursor
     )
 
-    return paginated_response(
+    return cursor_response(
         transactions,
         total=total,
         page=page,
         limit=limit,
+        columns=service.block_transactions_key,
     )
@@ -1,4 +1,4 @@
-from app.schemas import CustomModel, datetime_pd, PaginatedResponse
+from app.schemas import CustomModel, datetime_pd, CursorPaginatedResponse
 
 
 class BlockResponse(CustomModel):
@@ -8,4 +8,4 @@ class BlockResponse(CustomModel):
     tx: int
 
 
-BlockPaginatedResponse = PaginatedResponse[BlockResponse]
+BlockPaginatedResponse = CursorPaginatedResponse[BlockResponse]
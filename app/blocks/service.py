@@ -2,23 +2,30 @@ from sqlalchemy import select, func, ScalarResult
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Block, Transaction
+from app.cache import count_cache
+from app.tip import tipholder
+from app.utils import keyset
+
+# Keyset pagination sort keys
+blocks_key = [Block.height]
+block_transactions_key = [Transaction.block_index]
 
 
 async def get_latest_block(session: AsyncSession) -> Block:
-    return await session.scalar(
-        select(Block).order_by(Block.height.desc()).limit(1)
-    )
+    return await tipholder.get(session)  # type: ignore
 
 
 async def count_blocks(session: AsyncSession) -> int:
-    return await session.scalar(select(func.count(Block.id)))
+    return await count_cache.count(
+        session, ("blocks",), select(func.count(Block.id))
+    )
 
 
 async def get_blocks(
-    session: AsyncSession, offset: int, limit: int
+    session: AsyncSession, offset: int, limit: int, cursor: str | None = None
 ) -> ScalarResult[Block]:
     return await session.scalars(
-        select(Block).order_by(Block.height.desc()).offset(offset).limit(limit),
+        keyset(select(Block), blocks_key, cursor, offset).limit(limit + 1),
     )
 
 
@@ -27,28 +34,37 @@ async def get_block_by_hash(session: AsyncSession, hash_: str) -> Block:
 
 
 async def count_block_transactions(session: AsyncSession, hash_: str):
-    return await session.scalar(
+    return await count_cache.count(
+        session,
+        ("block_transactions", hash_),
         select(func.count(Transaction.id)).filter(
             Transaction.blockhash == hash_
-        )
+        ),
     )
 
 
 async def get_block_transactions(
-    session: AsyncSession, hash_: str, offset: int, limit: int
+    session: AsyncSession,
+    hash_: str,
+    offset: int,
+    limit: int,
+    cursor: str | None = None,
 ) -> list[Transaction]:
-    from app.transactions.service import load_tx_details
-
-    latest_block = await get_latest_block(session)
-    transactions = []
-    for transaction in await session.scalars(
-        select(Transaction)
-        .filter(Transaction.blockhash == hash_)
-        .offset(offset)
-        .limit(limit),
-    ):
-        transactions.append(
-            await load_tx_details(session, transaction, latest_block)
+    from app.transactions.service import load_transactions_details
+
+    transactions = (
+        await session.scalars(
+            keyset(
+                select(Transaction).filter(Transaction.blockhash == hash_),
+                block_transactions_key,
+                cursor,
+                offset,
+                descending=False,
+            ).limit(limit + 1),
         )
+    ).all()
+
+    # Extra row only marks the next page, its details are not needed
+    await load_transactions_details(session, transactions[:limit])
 
-    return transactions
+    return list(transactions)
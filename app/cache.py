@@ -0,0 +1,170 @@
+from collections.abc import Awaitable, Callable, Hashable
+from collections import OrderedDict
+from typing import Any, Protocol
+import hashlib
+import time
+import re
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Select
+from starlette.responses import Response
+from starlette.requests import Request
+
+from app.database import sessionmanager
+from app.tip import tipholder
+from app import constants
+
+
+async def get_tip(session: AsyncSession) -> str | None:
+    block = await tipholder.get(session)
+    return block.blockhash if block is not None else None
+
+
+class CountCache:
+    """Pagination totals, kept until the chain tip changes"""
+
+    def __init__(self):
+        self._values: OrderedDict[Hashable, int] = OrderedDict()
+        self._tip: str | None = None
+        self.init()
+
+    def init(self, size: int = constants.DEFAULT_CACHE_COUNTS):
+        self.size = size
+        self.clear()
+
+    def clear(self):
+        self._values.clear()
+        self._tip = None
+
+    async def count(
+        self, session: AsyncSession, key: Hashable, query: Select[Any]
+    ) -> int:
+        # Sync commits rows together with their block, so every count stays
+        # valid for as long as the same block is the tip
+        tip = await get_tip(session)
+
+        if tip != self._tip:
+            self._values.clear()
+            self._tip = tip
+
+        if key in self._values:
+            self._values.move_to_end(key)
+            return self._values[key]
+
+        value = await session.scalar(query) or 0
+
+        self._values[key] = value
+        if len(self._values) > self.size:
+            self._values.popitem(last=False)
+
+        return value
+
+
+class ResponseStore(Protocol):
+    async def get(self, key: str) -> tuple[str, bytes] | None: ...
+
+    async def set(self, key: str, value: tuple[str, bytes]): ...
+
+    async def clear(self): ...
+
+
+class MemoryStore:
+    """In-process LRU with a TTL per entry"""
+
+    def __init__(self, size: int, ttl: float):
+        self._values: OrderedDict[str, tuple[float, tuple[str, bytes]]] = (
+            OrderedDict()
+        )
+        self.size = size
+        self.ttl = ttl
+
+    async def get(self, key: str) -> tuple[str, bytes] | None:
+        if (entry := self._values.get(key)) is None:
+            return None
+
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._values[key]
+            return None
+
+        self._values.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: tuple[str, bytes]):
+        self._values[key] = (time.monotonic() + self.ttl, value)
+        self._values.move_to_end(key)
+
+        while len(self._values) > self.size:
+            self._values.popitem(last=False)
+
+    async def clear(self):
+        self._values.clear()
+
+
+class ResponseCache:
+    """Serialized GET responses keyed by the chain tip they were built on"""
+
+    # Routes whose response only changes when a block lands
+    routes = [
+        re.compile(r"^/blocks/[^/]+$"),
+        re.compile(r"^/transactions/(?!mempool$)[^/]+$"),
+        re.compile(r"^/address/[^/]+/transactions$"),
+    ]
+
+    def __init__(self):
+        self.init()
+
+    def init(
+        self,
+        size: int = constants.DEFAULT_CACHE_RESPONSES,
+        ttl: float = constants.DEFAULT_CACHE_TTL,
+        store: ResponseStore | None = None,
+    ):
+        self.enabled = size > 0
+        self.store: ResponseStore = store or MemoryStore(size, ttl)
+
+    async def clear(self):
+        await self.store.clear()
+
+    def cacheable(self, request: Request) -> bool:
+        return (
+            self.enabled
+            and request.method == "GET"
+            and any(route.match(request.url.path) for route in self.routes)
+        )
+
+    async def __call__(
+        self,
+        request: Request,
+        call_next: Callable[[Request], Awaitable[Response]],
+    ) -> Response:
+        if not self.cacheable(request):
+            return await call_next(request)
+
+        async with sessionmanager.session() as session:
+            tip = await get_tip(session)
+
+        # New tip or reorg changes the key, old entries age out of the LRU
+        key = f"{tip}:{request.url.path}?{request.url.query}"
+
+        if (cached := await self.store.get(key)) is None:
+            response = await call_next(request)
+
+            if response.status_code != 200:
+                return response
+
+            body = b"".join([chunk async for chunk in response.body_iterator])  # type: ignore
+            cached = ('"' + hashlib.sha256(body).hexdigest()[:32] + '"', body)
+
+            await self.store.set(key, cached)
+
+        etag, body = cached
+
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers={"ETag": etag})
+
+        return Response(body, media_type="application/json", headers={"ETag": etag})
+
+
+count_cache = CountCache()
+response_cache = ResponseCache()
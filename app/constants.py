@@ -1,3 +1,26 @@
+# Amounts are stored as integer satoshis
+COIN = 100_000_000
+
 DEFAULT_CURRENCY = "MBC"
 
 DEFAULT_PAGINATION_SIZE = 10
+
+DEFAULT_SYNC_PREFETCH = 8
+
+DEFAULT_SYNC_BULK_INSERT = True
+
+DEFAULT_RPC_CONNECTIONS = 10
+DEFAULT_RPC_TIMEOUT = 60
+DEFAULT_RPC_RETRIES = 3
+DEFAULT_RPC_BACKOFF = 0.5
+
+DEFAULT_CACHE_COUNTS = 10000
+DEFAULT_CACHE_RESPONSES = 10000
+DEFAULT_CACHE_TTL = 600
+DEFAULT_CACHE_TIP_TTL = 1
+
+DEFAULT_SYNC_COMMIT_BLOCKS = 100
+DEFAULT_SYNC_COMMIT_ROWS = 50000
+DEFAULT_SYNC_TIP_DISTANCE = 100
+
+DEFAULT_SYNC_PARTITION_SIZE = 100000
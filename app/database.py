@@ -1,6 +1,7 @@
 from typing import AsyncIterator
 import contextlib
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     async_sessionmaker,
@@ -10,6 +11,10 @@ from sqlalchemy.ext.asyncio import (
 )
 
 
+# Advisory lock held by initial sync for its whole run
+INITIAL_SYNC_LOCK = 0x6D62635F696E6974
+
+
 class DatabaseSessionManager:
     def __init__(self):
         self._sessionmaker: async_sessionmaker | None = None
@@ -44,6 +49,15 @@ class DatabaseSessionManager:
                 await connection.rollback()
                 raise
 
+    @contextlib.asynccontextmanager
+    async def autocommit(self) -> AsyncIterator[AsyncConnection]:
+        if self._engine is None:
+            raise Exception("DatabaseSessionManager is not initialized")
+
+        # Required by statements that can't run inside a transaction block
+        async with self._engine.connect() as connection:
+            yield await connection.execution_options(isolation_level="AUTOCOMMIT")
+
     @contextlib.asynccontextmanager
     async def session(self) -> AsyncIterator[AsyncSession]:
         if self._sessionmaker is None:
@@ -66,3 +80,17 @@ sessionmanager = DatabaseSessionManager()
 async def get_session():
     async with sessionmanager.session() as session:
         yield session
+
+
+async def ensure_no_initial_sync():
+    """Refuse to start while initial sync runs without secondary indexes"""
+    async with sessionmanager.autocommit() as connection:
+        if not await connection.scalar(
+            text("SELECT pg_try_advisory_lock_shared(:key)"),
+            {"key": INITIAL_SYNC_LOCK},
+        ):
+            raise Exception("Initial sync is running, wait for it to finish")
+
+        await connection.execute(
+            text("SELECT pg_advisory_unlock_shared(:key)"), {"key": INITIAL_SYNC_LOCK}
+        )
@@ -4,3 +4,8 @@ from fastapi import Query
 # Get current pagination page
 async def get_page(page: int = Query(gt=0, default=1)):
     return page
+
+
+# Get keyset pagination cursor returned by the previous page
+async def get_cursor(cursor: str | None = Query(default=None)):
+    return cursor
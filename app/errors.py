@@ -13,6 +13,8 @@ class ErrorResponse(CustomModel):
 errors = {
     "transactions": {"not-found": ("Transaction not found", 404)},
     "blocks": {"not-found": ("Block not found", 404)},
+    "outputs": {"not-found": ("Output not found", 404)},
+    "pagination": {"invalid-cursor": ("Invalid pagination cursor", 400)},
 }
 
 
@@ -1,7 +1,10 @@
 from .transaction import Transaction
+from .address import AddressTransaction
 from .address import AddressBalance
 from .address import Address
-from .mempool import MemPool
+from .mempool import MemPoolTransaction
+from .mempool import MemPoolOutput
+from .mempool import MemPoolInput
 from .output import Output
 from .block import Block
 from .input import Input
@@ -9,10 +12,13 @@ from .base import Base
 
 
 __all__ = [
+    "AddressTransaction",
     "AddressBalance",
     "Transaction",
     "Address",
-    "MemPool",
+    "MemPoolTransaction",
+    "MemPoolOutput",
+    "MemPoolInput",
     "Output",
     "Block",
     "Input",
@@ -1,8 +1,8 @@
 from sqlalchemy.orm import mapped_column, relationship
-from sqlalchemy import Numeric, ForeignKey
+from sqlalchemy import BigInteger, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import Mapped
 from sqlalchemy import String
-from decimal import Decimal
+from .types import HexBytes
 from .base import Base
 
 
@@ -16,10 +16,37 @@ class Address(Base):
 
 class AddressBalance(Base):
     __tablename__ = "service_address_balances"
-    balance: Mapped[Decimal] = mapped_column(Numeric(28, 8))
+    __table_args__ = (
+        UniqueConstraint(
+            "address_id",
+            "currency",
+            name="uq_service_address_balances_address_currency",
+        ),
+    )
+
+    balance: Mapped[int] = mapped_column(BigInteger)
     currency: Mapped[str] = mapped_column(String(64), index=True)
 
     address_id = mapped_column(ForeignKey("service_addresses.id"), primary_key=True)
     address: Mapped[Address] = relationship(
         foreign_keys=[address_id], back_populates="balances"
     )
+
+
+class AddressTransaction(Base):
+    __tablename__ = "service_address_transactions"
+    __table_args__ = (
+        # Newest transactions of an address as an ordered index range scan
+        Index(
+            "ix_service_address_transactions_address_height",
+            "address",
+            "height",
+            "block_index",
+        ),
+    )
+
+    address: Mapped[str] = mapped_column(String(70))
+    txid: Mapped[str] = mapped_column(HexBytes)
+    blockhash: Mapped[str] = mapped_column(HexBytes, index=True)
+    height: Mapped[int]
+    block_index: Mapped[int]
@@ -2,11 +2,45 @@ from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import DeclarativeBase
-from uuid import UUID, uuid4
+from uuid import UUID
+import secrets
+import time
+
+_last_ms = 0
+_counter = 0
+
+
+def uuid7() -> UUID:
+    """Time-ordered UUID (RFC 9562 version 7), monotonic within a process"""
+    global _last_ms, _counter
+
+    ms = time.time_ns() // 1_000_000
+
+    if ms > _last_ms:
+        _last_ms = ms
+        # Leave headroom so a burst within one millisecond doesn't overflow
+        _counter = secrets.randbits(72)
+    else:
+        _counter += 1
+
+        if _counter >> 74:
+            _last_ms += 1
+            _counter = secrets.randbits(72)
+
+    # 48 bit timestamp, version, 12 + 62 bit counter around the variant
+    return UUID(
+        int=_last_ms << 80
+        | 0x7 << 76
+        | (_counter >> 62) << 64
+        | 0b10 << 62
+        | (_counter & (1 << 62) - 1)
+    )
 
 
 class Base(AsyncAttrs, DeclarativeBase):
-    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
+    # Sequential keys append to the primary key index instead of
+    # touching a random page on every insert
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid7)
 
     @hybrid_property
     def reference(self):
@@ -1,14 +1,27 @@
 from sqlalchemy.orm import mapped_column
 from sqlalchemy.orm import Mapped
+from sqlalchemy import BigInteger, Index
 from sqlalchemy import String
+from .types import HexBytes
 from .base import Base
 
 
 class Input(Base):
     __tablename__ = "service_inputs"
+    __table_args__ = (
+        # Outpoint of the spent output, every output is spent only once
+        Index(
+            "ix_service_inputs_source_txid_index", "source_txid", "index", unique=True
+        ),
+    )
 
-    shortcut: Mapped[str] = mapped_column(String(70), index=True, unique=True)
-    blockhash: Mapped[str] = mapped_column(String(64), index=True)
-    txid: Mapped[str] = mapped_column(String(64), index=True)
-    source_txid: Mapped[str] = mapped_column(String(64), index=True)
+    blockhash: Mapped[str] = mapped_column(HexBytes, index=True)
+    txid: Mapped[str] = mapped_column(HexBytes, index=True)
+    source_txid: Mapped[str] = mapped_column(HexBytes)
+    height: Mapped[int]
     index: Mapped[int]
+
+    # Copied from the spent output when the block is written
+    amount: Mapped[int] = mapped_column(BigInteger, nullable=True)
+    currency: Mapped[str] = mapped_column(String(64), nullable=True)
+    address: Mapped[str] = mapped_column(String(70), nullable=True)
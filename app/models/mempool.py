@@ -1,9 +1,44 @@
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import BigInteger, String
+from datetime import datetime
 from typing import Any
 from .base import Base
 
 
-class MemPool(Base):
-    __tablename__ = "service_mempool"
-    raw: Mapped[dict[str, Any]] = mapped_column(JSONB)
+class MemPoolTransaction(Base):
+    __tablename__ = "service_mempool_transactions"
+
+    txid: Mapped[str] = mapped_column(String(64), index=True, unique=True)
+    created: Mapped[datetime] = mapped_column(index=True)
+    timestamp: Mapped[int] = mapped_column(nullable=True)
+    size: Mapped[int]
+    locktime: Mapped[int]
+    version: Mapped[int]
+
+
+class MemPoolOutput(Base):
+    __tablename__ = "service_mempool_outputs"
+
+    currency: Mapped[str] = mapped_column(String(64))
+
+    shortcut: Mapped[str] = mapped_column(String(70), index=True, unique=True)
+    address: Mapped[str] = mapped_column(String(70), index=True)
+    txid: Mapped[str] = mapped_column(String(64), index=True)
+    amount: Mapped[int] = mapped_column(BigInteger)
+    timelock: Mapped[int]
+    type: Mapped[str] = mapped_column(String(64))
+    script: Mapped[str]
+    asm: Mapped[str]
+    index: Mapped[int]
+
+    meta: Mapped[dict[str, Any]] = mapped_column(JSONB)
+
+
+class MemPoolInput(Base):
+    __tablename__ = "service_mempool_inputs"
+
+    shortcut: Mapped[str] = mapped_column(String(70), index=True)
+    txid: Mapped[str] = mapped_column(String(64), index=True)
+    source_txid: Mapped[str] = mapped_column(String(64))
+    index: Mapped[int]
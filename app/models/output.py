@@ -1,28 +1,35 @@
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import mapped_column
 from sqlalchemy.orm import Mapped
-from sqlalchemy import Numeric
+from sqlalchemy import BigInteger, Index
 from sqlalchemy import String
-from decimal import Decimal
+from .types import HexBytes
 from .base import Base
 from typing import Any
 
 
 class Output(Base):
     __tablename__ = "service_outputs"
+    __table_args__ = (
+        # Outpoint, spent outputs are looked up by it
+        Index("ix_service_outputs_txid_index", "txid", "index", unique=True),
+    )
 
     currency: Mapped[str] = mapped_column(String(64), index=True)
 
-    shortcut: Mapped[str] = mapped_column(String(70), index=True, unique=True)
-    blockhash: Mapped[str] = mapped_column(String(64), index=True)
+    blockhash: Mapped[str] = mapped_column(HexBytes, index=True)
     address: Mapped[str] = mapped_column(String(70), index=True)
-    txid: Mapped[str] = mapped_column(String(64), index=True)
-    amount: Mapped[Decimal] = mapped_column(Numeric(28, 8))
+    txid: Mapped[str] = mapped_column(HexBytes)
+    amount: Mapped[int] = mapped_column(BigInteger)
     timelock: Mapped[int]
     type: Mapped[str] = mapped_column(String(64), index=True)
-    script: Mapped[str]
+    script: Mapped[str] = mapped_column(HexBytes)
     asm: Mapped[str]
     spent: Mapped[bool]
+    # Spending transaction, set together with spent and cleared on reorg
+    spent_txid: Mapped[str] = mapped_column(HexBytes, nullable=True)
+    spent_height: Mapped[int] = mapped_column(nullable=True)
+    height: Mapped[int]
     index: Mapped[int]
 
     meta: Mapped[dict[str, Any]] = mapped_column(JSONB)
@@ -4,22 +4,20 @@ from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import mapped_column, Mapped
 from sqlalchemy import Index, String
 
+from .types import HexBytes
 from .base import Base
 
 
 class Transaction(Base):
     __tablename__ = "service_transactions"
     __table_args__ = (
-        Index(
-            "ix_service_transactions_addresses",
-            "addresses",
-            postgresql_using="gin",
-        ),
+        # Keyset pagination sort key
+        Index("ix_service_transactions_height_block_index", "height", "block_index"),
     )
 
     currencies: Mapped[list[str]] = mapped_column(ARRAY(String(64)), index=True)
-    txid: Mapped[str] = mapped_column(String(64), index=True, unique=True)
-    blockhash: Mapped[str] = mapped_column(String(64), index=True)
+    txid: Mapped[str] = mapped_column(HexBytes, index=True, unique=True)
+    blockhash: Mapped[str] = mapped_column(HexBytes, index=True)
     addresses: Mapped[list[str]] = mapped_column(ARRAY(String))
     created: Mapped[datetime]
     timestamp: Mapped[int]
@@ -28,7 +26,7 @@ class Transaction(Base):
     locktime: Mapped[int]
     version: Mapped[int]
 
-    amount: Mapped[dict[str, float]] = mapped_column(JSONB, default={})
+    amount: Mapped[dict[str, int]] = mapped_column(JSONB, default={})
 
     coinbase: Mapped[bool] = mapped_column(nullable=True)
-    block_index: Mapped[int] = mapped_column(nullable=True)
+    block_index: Mapped[int]
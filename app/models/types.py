@@ -0,0 +1,26 @@
+from typing import Any
+
+from sqlalchemy.types import TypeDecorator, LargeBinary
+
+
+def unhex(value: str) -> bytes:
+    # Malformed values are rejected instead of being stored as NULL,
+    # lookup parameters are validated before they reach a query
+    try:
+        return bytes.fromhex(value)
+    except ValueError:
+        raise ValueError(f"Invalid hex value {value!r}") from None
+
+
+class HexBytes(TypeDecorator[str]):
+    """Hex string in Python, raw bytes in the database"""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: str | None, dialect: Any) -> bytes | None:
+        return unhex(value) if value is not None else None
+
+    def process_result_value(self, value: bytes | None, dialect: Any) -> str | None:
+        return value.hex() if value is not None else None
+
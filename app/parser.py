@@ -1,28 +1,22 @@
+from collections.abc import Awaitable, Callable
 from typing import Any
 from app.settings import get_settings
 from collections import defaultdict
+from app.utils import to_satoshi
 from datetime import datetime
-from decimal import Decimal
 from app import constants
-import aiohttp
-import json
+from app.rpc import rpcclient
+
+# Looks up spent outputs by shortcut, returns the ones it knows about
+PrevoutResolver = Callable[[list[str]], Awaitable[dict[str, dict[str, Any]]]]
 
 
 async def make_request(
-    endpoint: str, requests: list[dict[str, Any]] | dict[str, Any] | None = None
+    endpoint: str,
+    requests: list[dict[str, Any]] | dict[str, Any] | None = None,
+    retry: bool = True,
 ):
-    if requests is None:
-        requests = []
-
-    async with aiohttp.ClientSession() as session:
-        headers = {"content-type": "application/json;"}
-        data = json.dumps(requests)
-
-        try:
-            async with session.post(endpoint, headers=headers, data=data) as r:
-                return await r.json()
-        except Exception:
-            raise
+    return await rpcclient.request(endpoint, requests, retry)
 
 
 def parse_meta(spk: dict[str, Any]) -> dict[str, Any]:
@@ -41,7 +35,7 @@ async def parse_outputs(transaction_data: dict[str, Any]):
 
         timelock = int(spk["asm"].split(" ", 1)[0]) if spk["type"] == "cltv" else 0
         currency = constants.DEFAULT_CURRENCY
-        amount = vout["value"]
+        amount = to_satoshi(vout["value"])
 
         # Extract metadata
         meta = parse_meta(spk)
@@ -56,7 +50,7 @@ async def parse_outputs(transaction_data: dict[str, Any]):
                 "currency": currency,
                 "type": spk["type"],
                 "index": vout["n"],
-                "amount": Decimal(str(amount)),
+                "amount": amount,
                 "spent": False,
                 "script": spk["hex"],
                 "asm": spk["asm"],
@@ -87,34 +81,64 @@ async def parse_inputs(transaction_data: dict[str, Any]):
     return inputs
 
 
-async def build_movements(
-    settings: Any, inputs: list[dict[str, Any]], outputs: list[dict[str, Any]]
-):
-    input_transactions_result = await make_request(
-        settings.blockchain.endpoint,
-        [
-            {
-                "id": f"input-tx-{txid}",
-                "method": "getrawtransaction",
-                "params": [txid, True],
-            }
-            for txid in list(set([vin["source_txid"] for vin in inputs]))
-        ],
+async def resolve_prevouts(
+    settings: Any,
+    inputs: list[dict[str, Any]],
+    outputs: list[dict[str, Any]],
+    resolver: PrevoutResolver | None = None,
+) -> dict[str, Any]:
+    # Outputs of earlier transactions in the same batch are already known
+    input_outputs: dict[str, Any] = {output["shortcut"]: output for output in outputs}
+
+    if resolver is not None:
+        shortcuts = [
+            vin["shortcut"] for vin in inputs if vin["shortcut"] not in input_outputs
+        ]
+
+        if shortcuts:
+            input_outputs.update(await resolver(shortcuts))
+
+    # Only ask the node about prevouts missing from the local index
+    source_txids = list(
+        set(
+            vin["source_txid"]
+            for vin in inputs
+            if vin["shortcut"] not in input_outputs
+        )
     )
 
-    input_outputs: dict[str, Any] = {}
+    if source_txids:
+        input_transactions_result = await make_request(
+            settings.blockchain.endpoint,
+            [
+                {
+                    "id": f"input-tx-{txid}",
+                    "method": "getrawtransaction",
+                    "params": [txid, True],
+                }
+                for txid in source_txids
+            ],
+        )
 
-    for transaction_result in input_transactions_result:
-        transaction_data = transaction_result["result"]
-        assert transaction_data
+        for transaction_result in input_transactions_result:
+            transaction_data = transaction_result["result"]
+            assert transaction_data
 
-        vin_vouts = await parse_outputs(transaction_data)
+            vin_vouts = await parse_outputs(transaction_data)
 
-        for vout in vin_vouts:
-            input_outputs[vout["shortcut"]] = vout
+            for vout in vin_vouts:
+                input_outputs[vout["shortcut"]] = vout
 
+    return input_outputs
+
+
+def build_movements(
+    inputs: list[dict[str, Any]],
+    outputs: list[dict[str, Any]],
+    prevouts: dict[str, Any],
+):
     # Use convenient defaultdict to not bloat code with setdefault calls
-    movements: dict[str, dict[str, Decimal]] = defaultdict(lambda: defaultdict(Decimal))
+    movements: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
 
     for output in outputs:
         currency = output["currency"]
@@ -124,7 +148,7 @@ async def build_movements(
         movements[currency][address] += amount
 
     for input in inputs:  # noqa
-        input_output = input_outputs[input["shortcut"]]
+        input_output = prevouts[input["shortcut"]]
         currency = input_output["currency"]
         address = input_output["address"]
         amount = input_output["amount"]
@@ -132,9 +156,7 @@ async def build_movements(
         movements[currency][address] -= amount
 
     return {
-        currency: {
-            address: float(amount) for address, amount in currency_movement.items()
-        }
+        currency: dict(currency_movement)
         for currency, currency_movement in movements.items()
     }
 
@@ -154,82 +176,165 @@ async def parse_transactions(txids: list[str]):
         ],
     )
 
+    return await parse_transactions_data(
+        txids,
+        [transaction_result["result"] for transaction_result in transactions_result],
+    )
+
+
+async def parse_transaction(
+    transaction_data: dict[str, Any], index: int
+) -> dict[str, Any]:
+    addresses = list(
+        set(
+            vout["scriptPubKey"]["address"]
+            for vout in transaction_data["vout"]
+            if vout["scriptPubKey"]["type"] != "nulldata"
+        )
+    )
+    timestamp = transaction_data.get("time", None)
+    created = datetime.fromtimestamp(timestamp) if timestamp else None
+
+    return {
+        "transaction": {
+            "created": created,
+            "addresses": addresses,
+            "blockhash": transaction_data.get("blockhash"),
+            "locktime": transaction_data["locktime"],
+            "version": transaction_data["version"],
+            "timestamp": timestamp,
+            "index": index,
+            "coinbase": index == 0,
+            "size": transaction_data["size"],
+            "txid": transaction_data["txid"],
+        },
+        "outputs": await parse_outputs(transaction_data),
+        "inputs": await parse_inputs(transaction_data),
+    }
+
+
+async def parse_transactions_data(
+    txids: list[str], transactions_data: list[dict[str, Any]]
+):
+    # Position lookup has to stay O(1) for blocks and mempools with many txs
+    positions = {txid: index for index, txid in enumerate(txids)}
+
     transactions: list[dict[str, Any]] = []
     outputs: list[dict[str, Any]] = []
     inputs: list[dict[str, Any]] = []
 
-    for transaction_result in transactions_result:
-        transaction_data = transaction_result["result"]
+    for transaction_data in transactions_data:
         assert transaction_data
-        index = txids.index(transaction_data["txid"])
 
-        addresses = list(
-            set(
-                vout["scriptPubKey"]["address"]
-                for vout in transaction_data["vout"]
-                if vout["scriptPubKey"]["type"] != "nulldata"
-            )
+        parsed = await parse_transaction(
+            transaction_data, positions[transaction_data["txid"]]
         )
-        timestamp = transaction_data.get("time", None)
-        created = datetime.fromtimestamp(timestamp) if timestamp else None
 
-        transactions.append(
-            {
-                "created": created,
-                "addresses": addresses,
-                "blockhash": transaction_data.get("blockhash"),
-                "locktime": transaction_data["locktime"],
-                "version": transaction_data["version"],
-                "timestamp": timestamp,
-                "index": index,
-                "coinbase": index == 0,
-                "size": transaction_data["size"],
-                "txid": transaction_data["txid"],
-            }
-        )
-
-        outputs += await parse_outputs(transaction_data)
-
-        inputs += await parse_inputs(transaction_data)
-
-    movements = await build_movements(settings, inputs, outputs)
+        transactions.append(parsed["transaction"])
+        outputs.extend(parsed["outputs"])
+        inputs.extend(parsed["inputs"])
 
     return {
         "transactions": transactions,
-        "movements": movements,
         "outputs": outputs,
         "inputs": inputs,
     }
 
 
-async def parse_block(height: int):
+async def get_block_hashes(heights: list[int]) -> dict[int, str]:
     settings = get_settings()
 
-    result: dict[str, Any] = {}
-
-    block_hash_result = await make_request(
+    block_hashes_result = await make_request(
         settings.blockchain.endpoint,  # type: ignore
-        {
-            "id": f"blockhash-#{height}",
-            "method": "getblockhash",
-            "params": [height],
-        },
+        [
+            {
+                "id": f"blockhash-#{height}",
+                "method": "getblockhash",
+                "params": [height],
+            }
+            for height in heights
+        ],
     )
 
-    block_hash = block_hash_result["result"]
+    block_hashes: dict[int, str] = {}
+    for block_hash_result in block_hashes_result:
+        height = int(block_hash_result["id"].removeprefix("blockhash-#"))
+        block_hashes[height] = block_hash_result["result"]
+
+    return block_hashes
 
-    block_data_result = await make_request(
+
+async def get_block(block_hash: str, verbosity: int = 1) -> dict[str, Any]:
+    """Whole getblock response, so callers can tell node errors apart"""
+    settings = get_settings()
+
+    return await make_request(
         settings.blockchain.endpoint,  # type: ignore
         {
             "id": f"block-#{block_hash}",
             "method": "getblock",
-            "params": [block_hash],
+            "params": [block_hash] if verbosity == 1 else [block_hash, verbosity],
         },
     )
 
-    block_data = block_data_result["result"]
 
-    transactions_data = await parse_transactions(block_data["tx"])
+# Node features detected at runtime, filled on first use
+capabilities: dict[str, bool] = {}
+
+# How nodes without verbosity 2 reject it: invalid parameter, type error
+# on the old boolean argument, unknown method or invalid params
+unsupported_verbosity_codes = {-8, -3, -32601, -32602}
+
+
+async def parse_block(height: int, block_hash: str | None = None):
+    result: dict[str, Any] = {}
+
+    if block_hash is None:
+        block_hash = (await get_block_hashes([height]))[height]
+
+    block_data = None
+    verbose = capabilities.get("verbose_blocks")
+
+    # Verbosity 2 returns decoded transactions inline with the block
+    if verbose is not False:
+        response = await get_block(block_hash, verbosity=2)
+        block_data = response["result"]
+
+        if block_data is None:
+            # Only an explicit rejection disables verbosity 2, after other
+            # failures this block falls back and the next one probes again
+            error = response.get("error") or {}
+            if error.get("code") in unsupported_verbosity_codes:
+                capabilities["verbose_blocks"] = False
+
+            verbose = False
+
+        elif verbose is None:
+            # Older nodes treat verbosity 2 as plain verbose
+            verbose = all(
+                isinstance(transaction, dict) for transaction in block_data["tx"]
+            )
+            capabilities["verbose_blocks"] = verbose
+
+    if verbose:
+        assert block_data
+
+        # Inline transactions lack the block fields getrawtransaction adds
+        transactions = [
+            {**transaction, "blockhash": block_data["hash"], "time": block_data["time"]}
+            for transaction in block_data["tx"]
+        ]
+        block_data["tx"] = [transaction["txid"] for transaction in transactions]
+
+        transactions_data = await parse_transactions_data(
+            block_data["tx"], transactions
+        )
+
+    else:
+        block_data = (await get_block(block_hash))["result"]
+        assert block_data
+
+        transactions_data = await parse_transactions(block_data["tx"])
 
     result["transactions"] = transactions_data["transactions"]
     result["outputs"] = transactions_data["outputs"]
@@ -237,7 +342,6 @@ async def parse_block(height: int):
     result["block"] = {
         "prev_blockhash": block_data.get("previousblockhash", None),
         "created": datetime.fromtimestamp(block_data["time"]),
-        "movements": transactions_data["movements"],
         "transactions": block_data["tx"],
         "blockhash": block_data["hash"],
         "timestamp": block_data["time"],
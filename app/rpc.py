@@ -0,0 +1,78 @@
+from typing import Any
+import asyncio
+import json
+
+import aiohttp
+
+from app import constants
+
+
+class RPCClient:
+    def __init__(self):
+        self._session: aiohttp.ClientSession | None = None
+        self.init()
+
+    def init(
+        self,
+        connections: int = constants.DEFAULT_RPC_CONNECTIONS,
+        timeout: float = constants.DEFAULT_RPC_TIMEOUT,
+        retries: int = constants.DEFAULT_RPC_RETRIES,
+        backoff: float = constants.DEFAULT_RPC_BACKOFF,
+    ):
+        self.connections = connections
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+        self._session = None
+
+    def session(self) -> aiohttp.ClientSession:
+        # Created lazily since aiohttp sessions are bound to the running loop
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.connections, keepalive_timeout=60
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"content-type": "application/json;"},
+            )
+
+        return self._session
+
+    async def request(
+        self,
+        endpoint: str,
+        requests: list[dict[str, Any]] | dict[str, Any] | None = None,
+        retry: bool = True,
+    ) -> Any:
+        if requests is None:
+            requests = []
+
+        data = json.dumps(requests)
+
+        # Requests with side effects may have reached the node before failing
+        retries = self.retries if retry else 0
+
+        for attempt in range(retries + 1):
+            try:
+                async with self.session().post(endpoint, data=data) as r:
+                    # Node work queue is full, worth another try
+                    if r.status == 503:
+                        raise aiohttp.ClientResponseError(
+                            r.request_info, r.history, status=r.status
+                        )
+
+                    return await r.json(content_type=None)
+
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == retries:
+                    raise
+
+            await asyncio.sleep(self.backoff * 2**attempt)
+
+
+rpcclient = RPCClient()
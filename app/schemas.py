@@ -22,13 +22,8 @@ timedelta_pd = Annotated[
     ),
 ]
 
-Satoshi = Annotated[
-    float,
-    PlainSerializer(
-        utils.to_satoshi,
-        return_type=int,
-    ),
-]
+# Amounts are stored and returned as integer satoshis
+Satoshi = int
 
 
 class CustomModel(BaseModel):
@@ -53,6 +48,15 @@ class PaginatedResponse(CustomModel, Generic[T]):
     list: list[T]
 
 
+class CursorPaginationDataResponse(PaginationDataResponse):
+    cursor: str | None
+
+
+class CursorPaginatedResponse(CustomModel, Generic[T]):
+    pagination: CursorPaginationDataResponse
+    list: list[T]
+
+
 class OutputResponse(CustomModel):
     address: str
     txid: str
@@ -93,7 +97,7 @@ class TransactionResponse(CustomModel):
     fee: Satoshi
 
 
-TransactionPaginatedResponse = PaginatedResponse[TransactionResponse]
+TransactionPaginatedResponse = CursorPaginatedResponse[TransactionResponse]
 
 
 class BalanceResponse(CustomModel):
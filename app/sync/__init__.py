@@ -1,4 +1,5 @@
 from .chain import sync_chain
 from .mempool import sync_mempool
+from .initial import initial_sync
 
-__all__ = ["sync_chain", "sync_mempool"]
+__all__ = ["sync_chain", "sync_mempool", "initial_sync"]
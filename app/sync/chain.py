@@ -1,33 +1,167 @@
-from sqlalchemy import select, update, delete, desc
-from app.parser import make_request, parse_block
+from sqlalchemy import select, insert, update, delete, desc, func, bindparam, tuple_
+from sqlalchemy import BigInteger, Integer, String, Uuid
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from collections.abc import AsyncGenerator
 from app.database import sessionmanager
 from app.settings import get_settings
+from app.tip import notify_tip
 from collections import defaultdict
-from decimal import Decimal
+from contextlib import aclosing
+from app import constants
 from typing import Any
+from app.models.types import HexBytes
+from app.models.base import uuid7
+from .partitions import partition_bounds, create_partitions
+import asyncio
+
+from app.parser import (
+    get_block_hashes,
+    resolve_prevouts,
+    build_movements,
+    make_request,
+    parse_block,
+)
 
 from app.models import (
+    AddressTransaction,
     AddressBalance,
     Transaction,
     Address,
     Output,
     Input,
     Block,
+    Base,
 )
 
 
+async def load_prevouts(
+    session: AsyncSession, shortcuts: list[str]
+) -> dict[str, dict[str, Any]]:
+    prevouts: dict[str, dict[str, Any]] = {}
+    outpoints = [shortcut.split(":") for shortcut in shortcuts]
+
+    for output in await session.execute(
+        select(
+            Output.txid, Output.index, Output.address, Output.currency, Output.amount
+        ).filter(
+            tuple_(Output.txid, Output.index).in_(
+                [(txid, int(index)) for txid, index in outpoints]
+            )
+        )
+    ):
+        shortcut = f"{output.txid}:{output.index}"
+
+        # Outpoint is only unique per partition on partitioned tables
+        if shortcut in prevouts:
+            raise Exception(f"Output {shortcut} is stored more than once")
+
+        prevouts[shortcut] = {
+            "currency": output.currency,
+            "address": output.address,
+            "amount": output.amount,
+        }
+
+    return prevouts
+
+
+async def insert_rows(
+    session: AsyncSession,
+    model: type[Base],
+    rows: list[dict[str, Any]],
+    bulk: bool = True,
+):
+    if not rows:
+        return
+
+    # Multi-row INSERT ... VALUES batches, skips the unit of work entirely
+    if bulk:
+        await session.execute(insert(model), rows)
+        return
+
+    session.add_all([model(**row) for row in rows])
+
+
+async def apply_movements(
+    session: AsyncSession, movements: dict[str, dict[str, int]], sign: int = 1
+):
+    """Add block movements to address balances in two set-based upserts"""
+    addresses = list(
+        set(address for movement in movements.values() for address in movement)
+    )
+
+    if not addresses:
+        return
+
+    # Whole block is passed as arrays, so statement size doesn't grow with it
+    new_addresses = func.unnest(
+        bindparam("ids", [uuid7() for _ in addresses], ARRAY(Uuid)),
+        bindparam("addresses", addresses, ARRAY(String)),
+    ).table_valued("id", "address").render_derived()
+
+    await session.execute(
+        pg_insert(Address)
+        .from_select(
+            ["id", "address"],
+            select(new_addresses.c.id, new_addresses.c.address),
+        )
+        .on_conflict_do_nothing(index_elements=[Address.address])
+    )
+
+    rows = [
+        (currency, address, amount * sign)
+        for currency, movement in movements.items()
+        for address, amount in movement.items()
+    ]
+
+    deltas = func.unnest(
+        bindparam("ids", [uuid7() for _ in rows], ARRAY(Uuid)),
+        bindparam("currencies", [row[0] for row in rows], ARRAY(String)),
+        bindparam("addresses", [row[1] for row in rows], ARRAY(String)),
+        bindparam("balances", [row[2] for row in rows], ARRAY(BigInteger)),
+    ).table_valued("id", "currency", "address", "balance").render_derived()
+
+    balances = pg_insert(AddressBalance).from_select(
+        ["id", "address_id", "currency", "balance"],
+        select(
+            deltas.c.id, Address.id, deltas.c.currency, deltas.c.balance
+        ).join(Address, Address.address == deltas.c.address),
+    )
+
+    await session.execute(
+        balances.on_conflict_do_update(
+            index_elements=[AddressBalance.address_id, AddressBalance.currency],
+            set_={"balance": AddressBalance.balance + balances.excluded.balance},
+        )
+    )
+
+
 async def process_block(session: AsyncSession, data: dict[str, Any]):
+    settings = get_settings()
+
+    # Movements are built here, in height order, so prevouts spent from
+    # earlier blocks are already in the local index
+    prevouts = await resolve_prevouts(
+        settings,
+        data["inputs"],
+        data["outputs"],
+        resolver=lambda shortcuts: load_prevouts(session, shortcuts),
+    )
+
+    data["block"]["movements"] = build_movements(
+        data["inputs"], data["outputs"], prevouts
+    )
+
     # Add new block
     block = Block(**data["block"])
     session.add(block)
 
     transaction_currencies: dict[str, list[str]] = defaultdict(list)
-    transaction_amounts: dict[str, dict[str, Decimal]] = defaultdict(
-        lambda: defaultdict(Decimal)
+    transaction_amounts: dict[str, dict[str, int]] = defaultdict(
+        lambda: defaultdict(int)
     )
 
-    # Add new outputs to the session
+    output_rows: list[dict[str, Any]] = []
     for output_data in data["outputs"]:
         txid = output_data["txid"]
         currency = output_data["currency"]
@@ -38,103 +172,111 @@ async def process_block(session: AsyncSession, data: dict[str, Any]):
 
         transaction_amounts[txid][currency] += output_data["amount"]
 
-        session.add(
-            Output(
-                **{
-                    "currency": output_data["currency"],
-                    "shortcut": output_data["shortcut"],
-                    "blockhash": output_data["blockhash"],
-                    "address": output_data["address"],
-                    "txid": output_data["txid"],
-                    "amount": output_data["amount"],
-                    "timelock": output_data["timelock"],
-                    "type": output_data["type"],
-                    "spent": output_data["spent"],
-                    "script": output_data["script"],
-                    "asm": output_data["asm"],
-                    "index": output_data["index"],
-                    "meta": output_data["meta"],
-                }
-            )
+        output_rows.append(
+            {
+                "currency": output_data["currency"],
+                "blockhash": output_data["blockhash"],
+                "address": output_data["address"],
+                "txid": output_data["txid"],
+                "amount": output_data["amount"],
+                "timelock": output_data["timelock"],
+                "type": output_data["type"],
+                "spent": output_data["spent"],
+                "script": output_data["script"],
+                "asm": output_data["asm"],
+                "height": block.height,
+                "index": output_data["index"],
+                "meta": output_data["meta"],
+            }
         )
 
-    # Add new transactions to the session
-    session.add_all(
-        [
-            Transaction(
-                **{
-                    "created": transaction_data["created"],
-                    "blockhash": transaction_data["blockhash"],
-                    "locktime": transaction_data["locktime"],
-                    "version": transaction_data["version"],
-                    "timestamp": transaction_data["timestamp"],
-                    "addresses": transaction_data["addresses"],
-                    "size": transaction_data["size"],
-                    "txid": transaction_data["txid"],
-                    "currencies": transaction_currencies[transaction_data["txid"]],
-                    "coinbase": transaction_data["coinbase"],
-                    "block_index": transaction_data["index"],
-                    "height": block.height,
-                    "amount": {
-                        currency: float(amount)
-                        for currency, amount in transaction_amounts[
-                            transaction_data["txid"]
-                        ].items()
-                    },
-                }
-            )
-            for transaction_data in data["transactions"]
-        ]
-    )
-
-    # Add new inputs to the session and collect spent output shortcuts
-    input_shortcuts: list[str] = []
+    transaction_rows: list[dict[str, Any]] = [
+        {
+            "created": transaction_data["created"],
+            "blockhash": transaction_data["blockhash"],
+            "locktime": transaction_data["locktime"],
+            "version": transaction_data["version"],
+            "timestamp": transaction_data["timestamp"],
+            "addresses": transaction_data["addresses"],
+            "size": transaction_data["size"],
+            "txid": transaction_data["txid"],
+            "currencies": transaction_currencies[transaction_data["txid"]],
+            "coinbase": transaction_data["coinbase"],
+            "block_index": transaction_data["index"],
+            "height": block.height,
+            "amount": dict(transaction_amounts[transaction_data["txid"]]),
+        }
+        for transaction_data in data["transactions"]
+    ]
+
+    input_rows: list[dict[str, Any]] = []
     for input_data in data["inputs"]:
-        input_shortcuts.append(input_data["shortcut"])
-        session.add(
-            Input(
-                **{
-                    "shortcut": input_data["shortcut"],
-                    "blockhash": input_data["blockhash"],
-                    "index": input_data["index"],
-                    "txid": input_data["txid"],
-                    "source_txid": input_data["source_txid"],
-                }
-            )
+        prevout = prevouts[input_data["shortcut"]]
+
+        input_rows.append(
+            {
+                "blockhash": input_data["blockhash"],
+                "index": input_data["index"],
+                "txid": input_data["txid"],
+                "source_txid": input_data["source_txid"],
+                "height": block.height,
+                "amount": prevout["amount"],
+                "currency": prevout["currency"],
+                "address": prevout["address"],
+            }
         )
 
-    # Mark outputs used in inputs as spent
-    await session.execute(
-        update(Output).filter(Output.shortcut.in_(input_shortcuts)).values(spent=True)
-    )
-
-    for currency, movement in data["block"]["movements"].items():
-        for raw_address, amount in movement.items():
-            if not (
-                address := await session.scalar(
-                    select(Address).filter(Address.address == raw_address)
-                )
-            ):
-                address = Address(address=raw_address)
-                session.add(address)
-
-            if not (
-                balance := await session.scalar(
-                    select(AddressBalance).filter(
-                        AddressBalance.currency == currency,
-                        AddressBalance.address == address,
-                    )
-                )
-            ):
-                balance = AddressBalance(
-                    balance=Decimal(0.0),
-                    currency=currency,
-                    address=address,
-                )
+    # Both receiving and spending addresses of every transaction
+    transaction_addresses: dict[str, set[str]] = defaultdict(set)
+    for output_data in data["outputs"]:
+        transaction_addresses[output_data["txid"]].add(output_data["address"])
+
+    for input_row in input_rows:
+        transaction_addresses[input_row["txid"]].add(input_row["address"])
+
+    address_transaction_rows: list[dict[str, Any]] = [
+        {
+            "address": address,
+            "txid": transaction_data["txid"],
+            "blockhash": transaction_data["blockhash"],
+            "height": block.height,
+            "block_index": transaction_data["index"],
+        }
+        for transaction_data in data["transactions"]
+        for address in sorted(transaction_addresses[transaction_data["txid"]])
+    ]
+
+    bulk = settings.get("sync.bulk_insert", constants.DEFAULT_SYNC_BULK_INSERT)
+
+    await insert_rows(session, Output, output_rows, bulk)
+    await insert_rows(session, Transaction, transaction_rows, bulk)
+    await insert_rows(session, Input, input_rows, bulk)
+    await insert_rows(session, AddressTransaction, address_transaction_rows, bulk)
+
+    # Link spent outputs to the spending transaction in one statement
+    if input_rows:
+        spends = func.unnest(
+            bindparam(
+                "source_txids",
+                [row["source_txid"] for row in input_rows],
+                ARRAY(HexBytes),
+            ),
+            bindparam("indexes", [row["index"] for row in input_rows], ARRAY(Integer)),
+            bindparam("txids", [row["txid"] for row in input_rows], ARRAY(HexBytes)),
+        ).table_valued("source_txid", "index", "txid").render_derived()
+
+        await session.execute(
+            update(Output)
+            .filter(
+                Output.txid == spends.c.source_txid, Output.index == spends.c.index
+            )
+            .values(spent=True, spent_txid=spends.c.txid, spent_height=block.height)
+            .execution_options(synchronize_session=False)
+        )
 
-                session.add(balance)
+    await apply_movements(session, data["block"]["movements"])
 
-            balance.balance += Decimal(str(amount))
+    await notify_tip(session)
 
     return block
 
@@ -143,30 +285,51 @@ async def process_reorg(session: AsyncSession, block: Block):
     reorg_height = block.height
     movements = block.movements
 
-    await session.execute(delete(Output).filter(Output.blockhash == block.blockhash))
+    # Outputs spent by the block become unspent again
+    await session.execute(
+        update(Output)
+        .filter(
+            tuple_(Output.txid, Output.index).in_(
+                select(Input.source_txid, Input.index).filter(
+                    Input.height == reorg_height, Input.blockhash == block.blockhash
+                )
+            )
+        )
+        .values(spent=False, spent_txid=None, spent_height=None)
+        .execution_options(synchronize_session=False)
+    )
 
-    await session.execute(delete(Input).filter(Input.blockhash == block.blockhash))
+    # Height limits the deletes to the newest partition
+    await session.execute(
+        delete(Output).filter(
+            Output.height == reorg_height, Output.blockhash == block.blockhash
+        )
+    )
 
     await session.execute(
-        delete(Transaction).filter(Transaction.blockhash == block.blockhash)
+        delete(Input).filter(
+            Input.height == reorg_height, Input.blockhash == block.blockhash
+        )
     )
 
-    await session.execute(delete(Block).filter(Block.blockhash == block.blockhash))
+    await session.execute(
+        delete(Transaction).filter(
+            Transaction.height == reorg_height,
+            Transaction.blockhash == block.blockhash,
+        )
+    )
 
-    for currency, movement in movements.items():
-        for raw_address, amount in movement.items():
-            balance = await session.scalar(
-                select(AddressBalance).filter(
-                    AddressBalance.currency == currency,
-                    AddressBalance.address_id == Address.id,
-                    Address.address == raw_address,
-                )
-            )
+    await session.execute(
+        delete(AddressTransaction).filter(
+            AddressTransaction.blockhash == block.blockhash
+        )
+    )
+
+    await session.execute(delete(Block).filter(Block.blockhash == block.blockhash))
 
-            if balance is None:
-                continue
+    await apply_movements(session, movements, sign=-1)
 
-            balance.balance -= Decimal(amount)
+    await notify_tip(session)
 
     new_latest = await session.scalar(
         select(Block).filter(Block.height == reorg_height - 1)
@@ -175,7 +338,40 @@ async def process_reorg(session: AsyncSession, block: Block):
     return new_latest
 
 
-async def sync_chain():
+async def prefetch_blocks(
+    start: int, stop: int, window: int
+) -> AsyncGenerator[dict[str, Any], None]:
+    """Yield parsed blocks for heights start..stop strictly in height order,
+    keeping up to `window` heights fetched and parsed ahead concurrently"""
+    pending: dict[int, asyncio.Task[dict[str, Any]]] = {}
+    block_hashes: dict[int, str] = {}
+    next_height = start
+
+    try:
+        for height in range(start, stop + 1):
+            while next_height <= stop and len(pending) < window:
+                # Hashes for a whole window are looked up in one batch
+                if next_height not in block_hashes:
+                    block_hashes = await get_block_hashes(
+                        list(range(next_height, min(next_height + window, stop + 1)))
+                    )
+
+                pending[next_height] = asyncio.create_task(
+                    parse_block(next_height, block_hashes.pop(next_height))
+                )
+                next_height += 1
+
+            yield await pending.pop(height)
+
+    finally:
+        # Drain the window when the consumer stops early (reorg, interrupt)
+        for task in pending.values():
+            task.cancel()
+
+        await asyncio.gather(*pending.values(), return_exceptions=True)
+
+
+async def sync_chain(target: int | None = None):
     settings = get_settings()
 
     async with sessionmanager.session() as session:
@@ -218,22 +414,87 @@ async def sync_chain():
         )
 
         chain_blocks = chain_data["result"]["blocks"]
+        stop = chain_blocks if target is None else min(target, chain_blocks)
         display_log = (chain_blocks - latest.height) < 100
 
-        for height in range(latest.height + 1, chain_blocks + 1):
+        window = settings.get("sync.prefetch", constants.DEFAULT_SYNC_PREFETCH)
+        commit_blocks = settings.get(
+            "sync.commit_blocks", constants.DEFAULT_SYNC_COMMIT_BLOCKS
+        )
+        commit_rows = settings.get(
+            "sync.commit_rows", constants.DEFAULT_SYNC_COMMIT_ROWS
+        )
+        tip_distance = settings.get(
+            "sync.tip_distance", constants.DEFAULT_SYNC_TIP_DISTANCE
+        )
+        partition_size = settings.get(
+            "sync.partition_size", constants.DEFAULT_SYNC_PARTITION_SIZE
+        )
+
+        # Empty unless the tables were converted by partition_tables
+        partitions = await partition_bounds(session)
+
+        # Blocks and rows written since the last commit. The latest committed
+        # block is the checkpoint an interrupted sync resumes from.
+        pending_blocks = 0
+        pending_rows = 0
+
+        async with aclosing(
+            prefetch_blocks(latest.height + 1, stop, max(window, 1))
+        ) as blocks:
             try:
-                if display_log:
-                    print(f"Processing block #{height}")
-                else:
-                    if height % 100 == 0:
+                async for block_data in blocks:
+                    height = block_data["block"]["height"]
+
+                    # Chain changed under the prefetch window, next run rewinds it
+                    if block_data["block"]["prev_blockhash"] != latest.blockhash:
+                        print(f"Found reorg at height #{height}")
+                        break
+
+                    # Keep a whole partition ahead of the block being written.
+                    # DDL locks the parent tables, so it gets its own transaction.
+                    if partitions and height + partition_size >= min(
+                        partitions.values()
+                    ):
+                        await session.commit()
+                        partitions = await create_partitions(
+                            session,
+                            partitions,
+                            height + partition_size,
+                            partition_size,
+                        )
+                        await session.commit()
+                        pending_blocks = pending_rows = 0
+
+                    if display_log:
                         print(f"Processing block #{height}")
+                    else:
+                        if height % 100 == 0:
+                            print(f"Processing block #{height}")
 
-                block_data = await parse_block(height)
+                    latest = await process_block(session, block_data)
 
-                await process_block(session, block_data)
+                    pending_blocks += 1
+                    pending_rows += (
+                        len(block_data["transactions"])
+                        + len(block_data["outputs"])
+                        + len(block_data["inputs"])
+                    )
 
-                await session.commit()
+                    # Catch-up groups blocks per transaction, near the tip
+                    # every block is committed on its own
+                    if (
+                        chain_blocks - height < tip_distance
+                        or pending_blocks >= commit_blocks
+                        or pending_rows >= commit_rows
+                    ):
+                        await session.commit()
+                        pending_blocks = pending_rows = 0
 
             except KeyboardInterrupt:
+                # Uncommitted batch is rolled back with the session
                 print("Keyboard interrupt")
-                break
+                return
+
+        if pending_blocks:
+            await session.commit()
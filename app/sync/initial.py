@@ -0,0 +1,119 @@
+from sqlalchemy.schema import CreateIndex, DropIndex
+from sqlalchemy.ext.asyncio import AsyncConnection
+from app.database import sessionmanager, INITIAL_SYNC_LOCK
+from sqlalchemy import Index, text
+from .partitions import partition_bounds
+from .chain import sync_chain
+import time
+
+from app.models import Transaction, Output, Input, AddressTransaction, Base
+
+bulk_tables = [
+    Base.metadata.tables[model.__tablename__]
+    for model in (Output, Input, Transaction, AddressTransaction)
+]
+
+
+def secondary_indexes() -> list[Index]:
+    """Non-unique indexes maintained row by row on the bulk tables"""
+    return [
+        index
+        for table in bulk_tables
+        for index in sorted(table.indexes, key=lambda index: str(index.name))
+        if not index.unique
+    ]
+
+
+async def ensure_exclusive(connection: AsyncConnection):
+    clients = (
+        await connection.execute(
+            text(
+                "SELECT application_name, client_addr FROM pg_stat_activity "
+                "WHERE datname = current_database() AND pid <> pg_backend_pid() "
+                "AND backend_type = 'client backend'"
+            )
+        )
+    ).all()
+
+    if clients:
+        raise Exception(
+            "Database is in use by other clients, stop the API and sync "
+            f"before running initial sync: {clients}"
+        )
+
+
+async def lock_initial_sync(connection: AsyncConnection):
+    if not await connection.scalar(
+        text("SELECT pg_try_advisory_lock(:key)"), {"key": INITIAL_SYNC_LOCK}
+    ):
+        raise Exception("Initial sync is already running")
+
+
+async def drop_secondary_indexes(connection: AsyncConnection):
+    for index in secondary_indexes():
+        print(f"Dropping index {index.name}")
+        await connection.execute(DropIndex(index, if_exists=True))
+
+
+async def create_secondary_indexes(connection: AsyncConnection):
+    indexes = secondary_indexes()
+    partitioned = await partition_bounds(connection)
+
+    # Partitioned tables don't support concurrent builds
+    serial = {
+        index.name
+        for table in bulk_tables
+        if table.name in partitioned
+        for index in table.indexes
+    }
+
+    # Interrupted concurrent builds leave invalid indexes behind
+    invalid = set(
+        await connection.scalars(
+            text(
+                "SELECT pg_class.relname FROM pg_index "
+                "JOIN pg_class ON pg_class.oid = pg_index.indexrelid "
+                "WHERE NOT pg_index.indisvalid AND pg_class.relname = ANY(:names)"
+            ),
+            {"names": [index.name for index in indexes]},
+        )
+    )
+
+    for index in indexes:
+        if index.name in invalid:
+            print(f"Dropping invalid index {index.name}")
+            await connection.execute(DropIndex(index, if_exists=True))
+
+    for number, index in enumerate(indexes, 1):
+        start = time.time()
+        print(f"Building index {index.name} ({number}/{len(indexes)})")
+
+        ddl = str(
+            CreateIndex(index, if_not_exists=True).compile(dialect=connection.dialect)
+        )
+
+        if index.name not in serial:
+            ddl = ddl.replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1)
+
+        await connection.execute(text(ddl))
+
+        print(f"Built index {index.name} in {time.time() - start:.1f} seconds")
+
+
+async def initial_sync(target: int | None = None):
+    # Lock is taken before the check, so API and sync processes started
+    # later refuse to run against the tables without indexes
+    async with sessionmanager.autocommit() as connection:
+        await lock_initial_sync(connection)
+
+        try:
+            await ensure_exclusive(connection)
+            await drop_secondary_indexes(connection)
+
+            await sync_chain(target)
+
+            await create_secondary_indexes(connection)
+        finally:
+            await connection.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": INITIAL_SYNC_LOCK}
+            )
@@ -1,9 +1,63 @@
+from datetime import datetime
+from typing import Any
 import time
 
 from app import sessionmanager, parser, get_settings
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models import MemPool
-from sqlalchemy import select
+from sqlalchemy import select, delete, String, any_, literal
+from sqlalchemy.dialects.postgresql import ARRAY
+from app.utils import utcnow
+from .chain import insert_rows
+
+from app.models import (
+    MemPoolTransaction,
+    MemPoolOutput,
+    MemPoolInput,
+)
+
+
+def mempool_rows(
+    data: dict[str, Any], now: datetime
+) -> dict[str, list[dict[str, Any]]]:
+    """Rows for parsed mempool transactions, built in a single pass each"""
+    return {
+        "transactions": [
+            {
+                "txid": transaction["txid"],
+                "created": transaction["created"] or now,
+                "timestamp": transaction["timestamp"],
+                "size": transaction["size"],
+                "locktime": transaction["locktime"],
+                "version": transaction["version"],
+            }
+            for transaction in data["transactions"]
+        ],
+        "outputs": [
+            {
+                "currency": output["currency"],
+                "shortcut": output["shortcut"],
+                "address": output["address"],
+                "txid": output["txid"],
+                "amount": output["amount"],
+                "timelock": output["timelock"],
+                "type": output["type"],
+                "script": output["script"],
+                "asm": output["asm"],
+                "index": output["index"],
+                "meta": output["meta"],
+            }
+            for output in data["outputs"]
+        ],
+        "inputs": [
+            {
+                "shortcut": input_["shortcut"],
+                "txid": input_["txid"],
+                "source_txid": input_["source_txid"],
+                "index": input_["index"],
+            }
+            for input_ in data["inputs"]
+        ],
+    }
 
 
 async def sync_mempool():
@@ -13,12 +67,6 @@ async def sync_mempool():
     async with sessionmanager.session() as session:
         session: AsyncSession
 
-        mempool = await session.scalar(select(MemPool).limit(1))
-
-        if mempool is None:
-            mempool = MemPool(raw={})
-            session.add(mempool)
-
         response = await parser.make_request(
             settings.blockchain.endpoint,
             {"id": "mempool", "method": "getrawmempool", "params": []},
@@ -26,42 +74,38 @@ async def sync_mempool():
         if response["error"]:
             return
 
-        data = await parser.parse_transactions(response["result"])
-
-        raw_mempool = {"transactions": [], "outputs": {}}
-
-        for transaction in data["transactions"]:
-            txid = transaction["txid"]
-            outputs = transaction.setdefault("outputs", [])
-            inputs = transaction.setdefault("inputs", [])
+        txids: list[str] = response["result"]
+        current = set(txids)
 
-            for output in data["outputs"].copy():
-                if output["txid"] != txid:
-                    continue
+        stored = set(await session.scalars(select(MemPoolTransaction.txid)))
 
-                output["amount"] = float(output["amount"])
+        # Only transactions that entered the mempool since last run are fetched
+        added = [txid for txid in txids if txid not in stored]
+        removed = [txid for txid in stored if txid not in current]
 
-                outputs.append(output)
-                raw_mempool["outputs"][output["shortcut"]] = output
-
-                # Reduce amount of next iterations
-                data["outputs"].remove(output)
-
-            for input_ in data["inputs"].copy():
-                if input_["txid"] != txid:
-                    continue
-
-                inputs.append(input_)
+        if not added and not removed:
+            return
 
-                # Reduce amount of next iterations
-                data["inputs"].remove(input_)
+        # Confirmed and evicted transactions are dropped with their rows
+        if removed:
+            for model in (MemPoolTransaction, MemPoolOutput, MemPoolInput):
+                await session.execute(
+                    delete(model).filter(
+                        model.txid == any_(literal(removed, ARRAY(String)))
+                    )
+                )
 
-            raw_mempool["transactions"].append(transaction)
+        if added:
+            data = await parser.parse_transactions(added)
+            rows = mempool_rows(data, utcnow())
 
-        mempool.raw = raw_mempool
+            await insert_rows(session, MemPoolTransaction, rows["transactions"])
+            await insert_rows(session, MemPoolOutput, rows["outputs"])
+            await insert_rows(session, MemPoolInput, rows["inputs"])
 
         await session.commit()
 
         print(
             f"Synced mempool in {(time.time() - start) * 1000:.3f} miliseconds"
+            f" (+{len(added)} -{len(removed)})"
         )
@@ -0,0 +1,145 @@
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy import text
+import re
+
+from app.models import Transaction, Output, Input
+
+partitioned_models = (Transaction, Output, Input)
+
+bound_pattern = re.compile(r"TO \('?(\d+)'?\)")
+
+
+async def partition_bounds(
+    connection: AsyncConnection | AsyncSession,
+) -> dict[str, int]:
+    """Upper height bound of the last partition of every partitioned table"""
+    names = [model.__tablename__ for model in partitioned_models]
+
+    rows = (
+        await connection.execute(
+            text(
+                "SELECT parent.relname, "
+                "pg_get_expr(child.relpartbound, child.oid) "
+                "FROM pg_partitioned_table "
+                "JOIN pg_class parent ON parent.oid = pg_partitioned_table.partrelid "
+                "LEFT JOIN pg_inherits ON pg_inherits.inhparent = parent.oid "
+                "LEFT JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE parent.relname = ANY(:names)"
+            ),
+            {"names": names},
+        )
+    ).all()
+
+    bounds: dict[str, int] = {}
+    for table, bound in rows:
+        match = bound_pattern.search(bound or "")
+        upper = int(match.group(1)) if match else 0
+        bounds[table] = max(bounds.get(table, 0), upper)
+
+    return bounds
+
+
+async def create_partitions(
+    connection: AsyncConnection | AsyncSession,
+    bounds: dict[str, int],
+    height: int,
+    size: int,
+) -> dict[str, int]:
+    """Add partitions of `size` heights until `height` is covered"""
+    bounds = dict(bounds)
+
+    for table, upper in bounds.items():
+        while upper <= height:
+            print(f"Creating partition of {table} for #{upper}-#{upper + size - 1}")
+
+            await connection.execute(
+                text(
+                    f"CREATE TABLE {table}_h{upper} PARTITION OF {table} "
+                    f"FOR VALUES FROM ({upper}) TO ({upper + size})"
+                )
+            )
+
+            upper += size
+
+        bounds[table] = upper
+
+    return bounds
+
+
+async def partition_tables(connection: AsyncConnection, size: int):
+    """Rebuild the bulk tables as partitioned by height range.
+
+    Rows are copied over, so this should run with the API and sync stopped.
+    Unique indexes can't span partitions and become regular ones."""
+    bounds = await partition_bounds(connection)
+
+    for model in partitioned_models:
+        table = model.__tablename__
+
+        if table in bounds:
+            print(f"Table {table} is already partitioned")
+            continue
+
+        tip = await connection.scalar(text(f"SELECT max(height) FROM {table}"))
+
+        print(f"Partitioning {table}")
+
+        await connection.execute(
+            text(
+                f"CREATE TABLE {table}_partitioned "
+                f"(LIKE {table} INCLUDING DEFAULTS INCLUDING STORAGE) "
+                "PARTITION BY RANGE (height)"
+            )
+        )
+
+        # One spare partition above the current tip for the sync to write to
+        await create_partitions(
+            connection,
+            {f"{table}_partitioned": 0},
+            (tip or 0) + size,
+            size,
+        )
+
+        await connection.execute(
+            text(f"INSERT INTO {table}_partitioned SELECT * FROM {table}")
+        )
+        await connection.execute(text(f"DROP TABLE {table}"))
+
+        await connection.execute(
+            text(f"ALTER TABLE {table}_partitioned RENAME TO {table}")
+        )
+
+        # Partition names keep the temporary prefix, align them with the table
+        for partition in await connection.scalars(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = CAST(:table AS regclass)"
+            ),
+            {"table": table},
+        ):
+            await connection.execute(
+                text(
+                    f"ALTER TABLE {partition} RENAME TO "
+                    + partition.replace(f"{table}_partitioned", table, 1)
+                )
+            )
+
+        await connection.execute(
+            text(
+                f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey "
+                "PRIMARY KEY (id, height)"
+            )
+        )
+
+        indexes = model.metadata.tables[table].indexes
+
+        for index in sorted(indexes, key=lambda index: str(index.name)):
+            print(f"Building index {index.name}")
+
+            ddl = str(CreateIndex(index).compile(dialect=connection.dialect))
+
+            await connection.execute(
+                text(ddl.replace("CREATE UNIQUE INDEX", "CREATE INDEX", 1))
+            )
@@ -0,0 +1,111 @@
+from contextlib import suppress
+import asyncio
+import math
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+
+from app.database import sessionmanager
+from app.models import Block
+from app import constants
+
+
+class TipHolder:
+    """Latest block shared by all requests
+
+    While listening the tip is kept until the sync notifies about a new
+    block, otherwise it is cached for a short TTL.
+    """
+
+    channel = "service_tip"
+
+    def __init__(self):
+        self._block: Block | None = None
+        self._expires = 0.0
+        self._generation = 0
+        self._listener: asyncio.Task[None] | None = None
+        self.listening = False
+        self.init()
+
+    def init(self, ttl: float = constants.DEFAULT_CACHE_TIP_TTL):
+        self.ttl = ttl
+        self.invalidate()
+
+    def invalidate(self, *_: object):
+        self._generation += 1
+        self._expires = 0.0
+
+    async def get(self, session: AsyncSession) -> Block | None:
+        if time.monotonic() < self._expires:
+            return self._block
+
+        generation = self._generation
+
+        block = await session.scalar(
+            select(Block).order_by(Block.height.desc()).limit(1)
+        )
+
+        # Shared between sessions, so it must not be expired by one of them
+        if block is not None:
+            session.expunge(block)
+
+        # Tip changed while the query was running, don't keep the old one
+        if generation != self._generation:
+            return block
+
+        self._block = block
+        self._expires = (
+            math.inf if self.listening else time.monotonic() + self.ttl
+        )
+
+        return block
+
+    async def listen(self):
+        while True:
+            try:
+                async with sessionmanager.autocommit() as connection:
+                    raw = await connection.get_raw_connection()
+                    driver = raw.driver_connection
+
+                    closed = asyncio.Event()
+                    driver.add_termination_listener(lambda _: closed.set())  # type: ignore
+                    await driver.add_listener(self.channel, self.invalidate)  # type: ignore
+
+                    # Anything cached before LISTEN might have missed a block
+                    self.listening = True
+                    self.invalidate()
+
+                    try:
+                        await closed.wait()
+                    finally:
+                        self.listening = False
+
+            except Exception as e:
+                print(f"Tip listener failed: {e}")
+
+            # Fall back to the TTL until reconnected
+            self.invalidate()
+            await asyncio.sleep(5)
+
+    def start(self):
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self.listen())
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+
+            with suppress(asyncio.CancelledError):
+                await self._listener
+
+        self._listener = None
+        self.invalidate()
+
+
+async def notify_tip(session: AsyncSession):
+    # Delivered on commit, repeated notifications in one transaction fold
+    await session.execute(select(func.pg_notify(TipHolder.channel, "")))
+
+
+tipholder = TipHolder()
@@ -1,7 +1,8 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import Depends
+from fastapi import Depends, Path
 
 from app.database import get_session
+from app.utils import is_hash
 from app.errors import Abort
 from . import service
 
@@ -9,9 +10,28 @@ from . import service
 async def require_transaction(
     txid: str, session: AsyncSession = Depends(get_session)
 ):
+    if not is_hash(txid):
+        raise Abort("transactions", "not-found")
+
     transaction = await service.get_transaction_by_txid(session, txid)
 
     if not transaction:
         raise Abort("transactions", "not-found")
 
     return transaction
+
+
+async def require_output(
+    txid: str,
+    index: int = Path(ge=0, le=0xFFFFFFFF),
+    session: AsyncSession = Depends(get_session),
+):
+    if not is_hash(txid):
+        raise Abort("outputs", "not-found")
+
+    output = await service.get_output(session, txid, index)
+
+    if not output:
+        raise Abort("outputs", "not-found")
+
+    return output
@@ -1,14 +1,14 @@
 from starlette.responses import JSONResponse
 
 from app.schemas import TransactionPaginatedResponse, TransactionResponse
-from app.utils import pagination, paginated_response
+from app.utils import pagination, cursor_response
 from sqlalchemy.ext.asyncio import AsyncSession
-from .dependencies import require_transaction
-from .schemas import TransactionBroadcastArgs
+from .dependencies import require_transaction, require_output
+from .schemas import TransactionBroadcastArgs, SpenderResponse
 from fastapi import APIRouter, Depends
-from app.dependencies import get_page
+from app.dependencies import get_page, get_cursor
 from app.database import get_session
-from app.models import Transaction
+from app.models import Transaction, Output
 from . import service
 
 router = APIRouter(prefix="/transactions", tags=["Transactions"])
@@ -18,18 +18,22 @@ router = APIRouter(prefix="/transactions", tags=["Transactions"])
 async def get_transactions(
     token: str = "MBC",
     page: int = Depends(get_page),
+    cursor: str | None = Depends(get_cursor),
     session: AsyncSession = Depends(get_session),
 ):
     limit, offset = pagination(page)
 
     total = await service.count_transactions(session, token)
-    transactions = await service.get_transactions(session, token, offset, limit)
+    transactions = await service.get_transactions(
+        session, token, offset, limit, cursor
+    )
 
-    return paginated_response(
+    return cursor_response(
         transactions,
         total=total,
         page=page,
         limit=limit,
+        columns=service.transactions_key,
     )
 
 
@@ -49,6 +53,15 @@ async def get_transaction_info(
     return transaction
 
 
+@router.get("/{txid}/outputs/{index}/spender", response_model=SpenderResponse)
+async def get_output_spender(output: Output = Depends(require_output)):
+    return {
+        "spent": output.spent,
+        "txid": output.spent_txid,
+        "height": output.spent_height,
+    }
+
+
 @router.post("/broadcast")
 async def broadcast_transaction(
     transaction: TransactionBroadcastArgs,
@@ -3,3 +3,9 @@ from app.schemas import CustomModel
 
 class TransactionBroadcastArgs(CustomModel):
     raw: str
+
+
+class SpenderResponse(CustomModel):
+    spent: bool
+    txid: str | None
+    height: int | None
@@ -1,12 +1,29 @@
-from decimal import Decimal
+from collections.abc import Sequence
+from collections import defaultdict
 from typing import Any
 
-from app.models import Transaction, Output, Input, Block, MemPool
+from app.models.types import HexBytes
+from app.models import (
+    MemPoolTransaction,
+    MemPoolOutput,
+    MemPoolInput,
+    Transaction,
+    Output,
+    Input,
+    Block,
+)
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.blocks.service import get_latest_block
-from sqlalchemy import select, Select, func
+from sqlalchemy import select, Select, String, func, any_, literal, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY
 from app.settings import get_settings
 from app.parser import make_request
+from app.cache import count_cache
+from app.utils import keyset
+
+# Keyset pagination sort key
+transactions_key = [Transaction.height, Transaction.block_index]
 
 
 async def get_token_units(_: AsyncSession, currency: str) -> int:
@@ -16,58 +33,104 @@ async def get_token_units(_: AsyncSession, currency: str) -> int:
     return 8
 
 
-async def load_tx_details(
+async def load_transactions_details(
     session: AsyncSession,
-    transaction: Transaction | None,
+    transactions: Sequence[Transaction],
     latest_block: Block | None = None,
-) -> Transaction | None:
-
-    if transaction is None:
-        return transaction
+) -> list[Transaction]:
+    if not transactions:
+        return []
 
     if latest_block is None:
         latest_block = await get_latest_block(session)
 
-    transaction.confirmations = latest_block.height - transaction.height  # type: ignore
-
-    transaction.fee = 0  # type: ignore
+    # Outputs, inputs and prevouts for the whole page are loaded with three
+    # queries and grouped per transaction in memory
+    txids = [transaction.txid for transaction in transactions]
 
-    output_shortcuts: dict[str, Output] = {}
-
-    transaction.outputs = []  # type: ignore
+    outputs: dict[str, list[Output]] = defaultdict(list)
     for output in await session.scalars(
-        select(Output).filter(Output.txid == transaction.txid).order_by(Output.index)
+        select(Output)
+        .filter(Output.txid == any_(literal(txids, ARRAY(HexBytes))))
+        .order_by(Output.index)
     ):
-        output: Output
-        output.units = await get_token_units(session, output.currency)  # type: ignore
-
-        output_shortcuts[output.shortcut] = output
-        transaction.outputs.append(output)  # type: ignore
+        outputs[output.txid].append(output)
 
-        if output.currency == "MBC":
-            transaction.fee -= output.amount  # type: ignore
-
-    transaction.inputs = []  # type: ignore
+    inputs: dict[str, list[Input]] = defaultdict(list)
     for input_ in await session.scalars(
-        select(Input).filter(Input.txid == transaction.txid)
+        select(Input).filter(Input.txid == any_(literal(txids, ARRAY(HexBytes))))
     ):
-        input_: Input
+        inputs[input_.txid].append(input_)
+
+    # Inputs carry their prevout, only rows written before that was stored
+    # need a lookup
+    outpoints = [
+        (input_.source_txid, input_.index)
+        for txid in inputs
+        for input_ in inputs[txid]
+        if input_.amount is None
+    ]
 
-        output = await session.scalar(  # type: ignore
-            select(Output).filter(Output.shortcut == input_.shortcut)
-        )
+    prevouts: dict[tuple[str, int], Output] = {}
+    if outpoints:
+        for output in await session.scalars(
+            select(Output).filter(tuple_(Output.txid, Output.index).in_(outpoints))
+        ):
+            prevouts[(output.txid, output.index)] = output
+
+    for transaction in transactions:
+        transaction.confirmations = latest_block.height - transaction.height  # type: ignore
 
-        input_.amount = output.amount  # type: ignore
-        input_.units = await get_token_units(session, output.currency)  # type: ignore
-        input_.currency = output.currency  # type: ignore
-        input_.address = output.address  # type: ignore
+        transaction.fee = 0  # type: ignore
 
-        transaction.inputs.append(input_)  # type: ignore
+        transaction.outputs = []  # type: ignore
+        for output in outputs[transaction.txid]:
+            output.units = await get_token_units(session, output.currency)  # type: ignore
 
-        if output.currency == "MBC":
-            transaction.fee += output.amount  # type: ignore
+            transaction.outputs.append(output)  # type: ignore
 
-    return transaction
+            if output.currency == "MBC":
+                transaction.fee -= output.amount  # type: ignore
+
+        transaction.inputs = []  # type: ignore
+        for input_ in inputs[transaction.txid]:
+            if input_.amount is None:
+                output = prevouts[(input_.source_txid, input_.index)]
+
+                # Filled for the response only, the row is left unchanged
+                set_committed_value(input_, "amount", output.amount)
+                set_committed_value(input_, "currency", output.currency)
+                set_committed_value(input_, "address", output.address)
+
+            input_.units = await get_token_units(session, input_.currency)  # type: ignore
+
+            transaction.inputs.append(input_)  # type: ignore
+
+            if input_.currency == "MBC":
+                transaction.fee += input_.amount  # type: ignore
+
+    return list(transactions)
+
+
+async def load_tx_details(
+    session: AsyncSession,
+    transaction: Transaction | None,
+    latest_block: Block | None = None,
+) -> Transaction | None:
+
+    if transaction is None:
+        return transaction
+
+    return (await load_transactions_details(session, [transaction], latest_block))[0]
+
+
+async def get_output(session: AsyncSession, txid: str, index: int) -> Output | None:
+    # Outpoint is only unique per partition on partitioned tables
+    return (
+        await session.scalars(
+            select(Output).filter(Output.txid == txid, Output.index == index)
+        )
+    ).one_or_none()
 
 
 async def get_transaction_by_txid(
@@ -84,36 +147,34 @@ def transactions_filter(query: Select[Any], currency: str) -> Select[Any]:
 
 
 async def count_transactions(session: AsyncSession, currency: str) -> int:
-    return (
-        await session.scalar(
-            transactions_filter(select(func.count(Transaction.id)), currency)
-        )
-        or 0
+    return await count_cache.count(
+        session,
+        ("transactions", currency.upper()),
+        transactions_filter(select(func.count(Transaction.id)), currency),
     )
 
 
 async def get_transactions(
-    session: AsyncSession, currency: str, offset: int, limit: int
+    session: AsyncSession,
+    currency: str,
+    offset: int,
+    limit: int,
+    cursor: str | None = None,
 ) -> list[Transaction]:
-    latest_block = await get_latest_block(session)
-
-    transactions: list[Transaction] = []
-    for tx in await session.scalars(
-        transactions_filter(
-            select(Transaction)
-            .order_by(Transaction.height.desc())
-            .offset(offset)
-            .limit(limit),
-            currency,
+    transactions = (
+        await session.scalars(
+            transactions_filter(
+                keyset(select(Transaction), transactions_key, cursor, offset)
+                .limit(limit + 1),
+                currency,
+            )
         )
-    ):
-        transaction = await load_tx_details(session, tx, latest_block=latest_block)
-        if transaction is None:
-            continue
+    ).all()
 
-        transactions.append(transaction)
+    # Extra row only marks the next page, its details are not needed
+    await load_transactions_details(session, transactions[:limit])
 
-    return transactions
+    return list(transactions)
 
 
 async def broadcast_transaction(raw: str):
@@ -122,60 +183,119 @@ async def broadcast_transaction(raw: str):
     return await make_request(
         settings.blockchain.endpoint,
         {"id": "broadcast", "method": "sendrawtransaction", "params": [raw]},
+        retry=False,
     )
 
 
-async def load_mempool_tx_details(
-    session: AsyncSession,
-    transaction: dict[str, Any],
-    mempool_outputs: dict[str, dict[str, Any]],
-) -> dict[str, Any]:
-    transaction["height"] = None
-    transaction["confirmations"] = 0
-    transaction["amount"] = {}
-    transaction["fee"] = Decimal(0)
-
-    for output in transaction["outputs"]:
-        output["units"] = await get_token_units(session, output["currency"])
-
-        transaction["amount"].setdefault(output["currency"], Decimal(0))  # type: ignore
-        transaction["amount"][output["currency"]] += Decimal(output["amount"])
-
-        if output["currency"] == "MBC":
-            transaction["fee"] -= Decimal(output["amount"])
-
-    for input_ in transaction["inputs"]:
-        if input_["shortcut"] in mempool_outputs:
-            output = mempool_outputs[input_["shortcut"]]
-
-            input_["amount"] = Decimal(str(output["amount"]))
-            input_["units"] = await get_token_units(session, output["currency"])
-            input_["currency"] = output["currency"]
-            input_["address"] = output["address"]
-
-        else:
-            output_: Output = await session.scalar(  # type: ignore
-                select(Output).filter(Output.shortcut == input_["shortcut"])
+async def load_mempool_transactions(
+    session: AsyncSession, transactions: Sequence[MemPoolTransaction]
+) -> list[dict[str, Any]]:
+    txids = [transaction.txid for transaction in transactions]
+
+    outputs: dict[str, list[MemPoolOutput]] = defaultdict(list)
+    for output in await session.scalars(
+        select(MemPoolOutput)
+        .filter(MemPoolOutput.txid == any_(literal(txids, ARRAY(String))))
+        .order_by(MemPoolOutput.index)
+    ):
+        outputs[output.txid].append(output)
+
+    inputs: dict[str, list[MemPoolInput]] = defaultdict(list)
+    for input_ in await session.scalars(
+        select(MemPoolInput).filter(
+            MemPoolInput.txid == any_(literal(txids, ARRAY(String)))
+        )
+    ):
+        inputs[input_.txid].append(input_)
+
+    # Prevouts are either unconfirmed outputs or already in the chain index
+    shortcuts = [input_.shortcut for txid in inputs for input_ in inputs[txid]]
+    prevouts: dict[str, MemPoolOutput | Output] = {
+        output.shortcut: output
+        for output in await session.scalars(
+            select(MemPoolOutput).filter(
+                MemPoolOutput.shortcut == any_(literal(shortcuts, ARRAY(String)))
+            )
+        )
+    }
+
+    if missing := [
+        (input_.source_txid, input_.index)
+        for txid in inputs
+        for input_ in inputs[txid]
+        if input_.shortcut not in prevouts
+    ]:
+        for output in await session.scalars(
+            select(Output).filter(tuple_(Output.txid, Output.index).in_(missing))
+        ):
+            prevouts[f"{output.txid}:{output.index}"] = output
+
+    result: list[dict[str, Any]] = []
+    for transaction in transactions:
+        details: dict[str, Any] = {
+            "txid": transaction.txid,
+            "timestamp": transaction.timestamp,
+            "height": None,
+            "blockhash": None,
+            "coinbase": False,
+            "confirmations": 0,
+            "amount": {},
+            "fee": 0,
+            "outputs": [],
+            "inputs": [],
+        }
+
+        for output in outputs[transaction.txid]:
+            details["outputs"].append(
+                {
+                    "address": output.address,
+                    "txid": output.txid,
+                    "currency": output.currency,
+                    "amount": output.amount,
+                    "timelock": output.timelock,
+                    "type": output.type,
+                    "spent": False,
+                    "script": output.script,
+                    "asm": output.asm,
+                    "index": output.index,
+                    "units": await get_token_units(session, output.currency),
+                }
             )
 
-            input_["amount"] = output_.amount  # type: ignore
-            input_["units"] = await get_token_units(session, output_.currency)
-            input_["currency"] = output_.currency
-            input_["address"] = output_.address
+            details["amount"].setdefault(output.currency, 0)
+            details["amount"][output.currency] += output.amount
 
-        if input_["currency"] == "MBC":
-            transaction["fee"] += input_["amount"]
+            if output.currency == "MBC":
+                details["fee"] -= output.amount
 
-    return transaction
+        for input_ in inputs[transaction.txid]:
+            # Skipping the input would report a wrong amount and fee
+            if (prevout := prevouts.get(input_.shortcut)) is None:
+                raise Exception(f"Prevout {input_.shortcut} is not stored")
 
+            details["inputs"].append(
+                {
+                    "amount": prevout.amount,
+                    "units": await get_token_units(session, prevout.currency),
+                    "currency": prevout.currency,
+                    "address": prevout.address,
+                }
+            )
 
-async def get_mempool_transactions(session: AsyncSession) -> list[dict[str, Any]]:
-    mempool = await session.scalar(select(MemPool).limit(1))
+            if prevout.currency == "MBC":
+                details["fee"] += prevout.amount
 
-    if mempool is None:
-        return []
+        result.append(details)
 
-    return [
-        await load_mempool_tx_details(session, transaction, mempool.raw["outputs"])
-        for transaction in mempool.raw["transactions"]
-    ]
+    return result
+
+
+async def get_mempool_transactions(session: AsyncSession) -> list[dict[str, Any]]:
+    return await load_mempool_transactions(
+        session,
+        (
+            await session.scalars(
+                select(MemPoolTransaction).order_by(MemPoolTransaction.created.desc())
+            )
+        ).all(),
+    )
@@ -1,8 +1,15 @@
 from datetime import datetime, timezone, UTC
 from collections.abc import Sequence
+from decimal import Decimal
 from typing import Any
+import binascii
+import base64
+import json
 import math
 
+from sqlalchemy import Select, tuple_, literal
+from sqlalchemy.orm import QueryableAttribute
+
 from app import constants
 
 
@@ -16,6 +23,14 @@ def to_timestamp(date: datetime | None) -> int | None:
     return int(date.timestamp()) if date else None
 
 
+# Transaction and block hashes are 32 bytes, hex encoded
+def is_hash(value: str) -> bool:
+    try:
+        return len(bytes.fromhex(value)) == 32
+    except ValueError:
+        return False
+
+
 # Helper function for pagination
 def pagination(page: int, size: int = constants.DEFAULT_PAGINATION_SIZE):
     """limit, offset = pagination(:page, :page_size)"""
@@ -42,5 +57,86 @@ def paginated_response(
     }
 
 
-def to_satoshi(x: float) -> int:
-    return int(x * math.pow(10, 8))
+# Opaque cursor with the sort key values of the last item on a page
+def encode_cursor(values: Sequence[Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values, default=str).encode()).decode()
+
+
+def decode_cursor(cursor: str, columns: Sequence[QueryableAttribute[Any]]) -> list[Any]:
+    from app.errors import Abort
+
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor))
+
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("Cursor does not match sort key")
+
+        return [
+            (
+                datetime.fromisoformat(value)
+                if column.type.python_type is datetime
+                else column.type.python_type(value)
+            )
+            for column, value in zip(columns, values)
+        ]
+
+    except (binascii.Error, TypeError, ValueError):
+        raise Abort("pagination", "invalid-cursor")
+
+
+def keyset(
+    query: Select[Any],
+    columns: Sequence[QueryableAttribute[Any]],
+    cursor: str | None,
+    offset: int = 0,
+    descending: bool = True,
+) -> Select[Any]:
+    """Order query by columns and continue after cursor instead of using OFFSET.
+
+    The cursor already points past the previous page, `offset` only applies
+    to requests without one"""
+    query = query.order_by(
+        *[column.desc() if descending else column.asc() for column in columns]
+    )
+
+    if cursor is None:
+        return query.offset(offset)
+
+    key = tuple_(*columns)
+    after = tuple_(
+        *[
+            literal(value, column.type)
+            for column, value in zip(columns, decode_cursor(cursor, columns))
+        ]
+    )
+
+    return query.filter(key < after if descending else key > after)
+
+
+def next_cursor(
+    items: Sequence[Any], columns: Sequence[QueryableAttribute[Any]], limit: int
+) -> str | None:
+    # Row past the page only tells that another page follows
+    if len(items) <= limit:
+        return None
+
+    return encode_cursor([getattr(items[limit - 1], column.key) for column in columns])
+
+
+def cursor_response(
+    items: Sequence[Any],
+    total: int,
+    page: int,
+    limit: int,
+    columns: Sequence[QueryableAttribute[Any]],
+) -> dict[str, Any]:
+    """Page of `limit` items, fetched with one extra row to find the next page"""
+    response = paginated_response(items[:limit], total, page, limit)
+    response["pagination"]["cursor"] = next_cursor(items, columns, limit)
+
+    return response
+
+
+def to_satoshi(x: float | str | Decimal) -> int:
+    # Through the decimal string, so 0.1 is exactly 10000000
+    return int(Decimal(str(x)) * constants.COIN)
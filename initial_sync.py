@@ -0,0 +1,32 @@
+from app import sessionmanager, get_settings
+from app.sync import initial_sync
+from app.rpc import rpcclient
+import argparse
+import asyncio
+
+
+async def main(target: int | None):
+    settings = get_settings()
+
+    sessionmanager.init(settings.database.endpoint)
+    rpcclient.init(**settings.get("rpc", {}))
+
+    try:
+        await initial_sync(target)
+    finally:
+        await sessionmanager.close()
+        await rpcclient.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Bulk load the chain with secondary indexes deferred"
+    )
+    parser.add_argument(
+        "--height",
+        type=int,
+        default=None,
+        help="Stop at this height instead of the node tip",
+    )
+
+    asyncio.run(main(parser.parse_args().height))
@@ -0,0 +1,101 @@
+import asyncio
+import pathlib
+import typing
+import sys
+
+sys.path.append(str(pathlib.Path(__file__).parent.parent))
+
+from sqlalchemy import func, select, update
+
+from app.database import sessionmanager
+from app.parser import resolve_prevouts
+from app.sync.chain import load_prevouts
+from app.settings import get_settings
+from app.rpc import rpcclient
+from app.models import Input
+
+settings: typing.Any = get_settings()
+
+
+async def main():
+    sessionmanager.init(settings.database.endpoint)
+    rpcclient.init(**settings.get("rpc", {}))
+
+    async with sessionmanager.session() as session:
+
+        total = (
+            await session.scalar(
+                select(func.count(Input.id)).filter(Input.amount == None)
+            )
+            or 0
+        )
+        limit = 10000
+
+        processed = 0
+        missing = 0
+        last_id = None
+
+        # Walk inputs in id order so every batch moves forward, even when
+        # some prevouts can't be resolved and stay empty
+        while True:
+            query = (
+                select(Input.id, Input.source_txid, Input.index)
+                .filter(Input.amount == None)
+                .order_by(Input.id)
+                .limit(limit)
+            )
+
+            if last_id is not None:
+                query = query.filter(Input.id > last_id)
+
+            batch = (await session.execute(query)).all()
+
+            if not batch:
+                break
+
+            last_id = batch[-1].id
+            shortcuts = [f"{row.source_txid}:{row.index}" for row in batch]
+
+            # Local output index first, node for outputs it doesn't have
+            prevouts = await resolve_prevouts(
+                settings,
+                [
+                    {"shortcut": shortcut, "source_txid": row.source_txid}
+                    for row, shortcut in zip(batch, shortcuts)
+                ],
+                [],
+                resolver=lambda shortcuts: load_prevouts(session, shortcuts),
+            )
+
+            rows = [
+                {
+                    "id": row.id,
+                    "amount": prevouts[shortcut]["amount"],
+                    "currency": prevouts[shortcut]["currency"],
+                    "address": prevouts[shortcut]["address"],
+                }
+                for row, shortcut in zip(batch, shortcuts)
+                if shortcut in prevouts
+            ]
+
+            if rows:
+                await session.execute(update(Input), rows)
+
+            await session.commit()
+
+            processed += len(batch)
+            missing += len(batch) - len(rows)
+            print(
+                f"Progress: {processed}/{total} ({(processed/total)*100:.2f})",
+                end="\r",
+                flush=True,
+            )
+
+        print(f"\nDone, {missing} inputs spend outputs without a known prevout")
+
+    await sessionmanager.close()
+    await rpcclient.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,3 +1,4 @@
+from decimal import Decimal
 import asyncio
 import typing
 
@@ -7,6 +8,7 @@ from sqlalchemy import func, select
 from app.database import sessionmanager
 from app.models import AddressBalance
 from app.settings import get_settings
+from app.constants import COIN
 
 settings: typing.Any = get_settings()
 
@@ -25,8 +27,11 @@ async def main():
 
         current = 0
         async for balance in balances:
+            # Fixed point, small balances would otherwise print as 1E-8
+            amount = Decimal(balance.balance) / COIN
+
             print(
-                f"{balance.address.address},{float(balance.balance)},{balance.currency}",
+                f"{balance.address.address},{amount:.8f},{balance.currency}",
                 file=file,
             )
 
@@ -0,0 +1,31 @@
+import asyncio
+import pathlib
+import typing
+import sys
+
+sys.path.append(str(pathlib.Path(__file__).parent.parent))
+
+from app.sync.partitions import partition_tables
+from app.database import sessionmanager
+from app.settings import get_settings
+from app import constants
+
+settings: typing.Any = get_settings()
+
+
+async def main():
+    sessionmanager.init(settings.database.endpoint)
+
+    size = settings.get("sync.partition_size", constants.DEFAULT_SYNC_PARTITION_SIZE)
+
+    # Whole conversion is a single transaction, stop the API and sync first
+    async with sessionmanager.connect() as connection:
+        await partition_tables(connection, size)
+
+    await sessionmanager.close()
+
+    print("Done")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,6 +1,8 @@
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from app import sessionmanager, get_settings
+from app.rpc import rpcclient
 from app.sync import sync_chain, sync_mempool
+from app.database import ensure_no_initial_sync
 from datetime import datetime
 import asyncio
 
@@ -10,6 +12,9 @@ async def main():
     settings = get_settings()
 
     sessionmanager.init(settings.database.endpoint)
+    rpcclient.init(**settings.get("rpc", {}))
+
+    await ensure_no_initial_sync()
 
     scheduler.add_job(
         sync_chain, "interval", seconds=10, next_run_time=datetime.now()
@@ -25,6 +30,7 @@ async def main():
             await asyncio.sleep(3600)
     finally:
         await sessionmanager.close()
+        await rpcclient.close()
 
 
 if __name__ == "__main__":
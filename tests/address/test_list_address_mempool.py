@@ -0,0 +1,25 @@
+from tests.client_requests import addresses
+from tests import helpers
+
+
+async def test_normal(client, session, address):
+    received = await helpers.create_mempool_transaction(
+        session, [(address.address, 1.0)]
+    )
+    await helpers.create_mempool_transaction(session, [("someone else", 1.0)])
+
+    response = await addresses.get_address_mempool(client, address.address)
+    print(response.json())
+    assert response.status_code == 200
+
+    assert [transaction["txid"] for transaction in response.json()] == [
+        received.txid
+    ]
+
+
+async def test_none(client, address):
+    response = await addresses.get_address_mempool(client, address.address)
+    print(response.json())
+    assert response.status_code == 200
+
+    assert response.json() == []
@@ -1,5 +1,5 @@
 from tests.client_requests import addresses
-from app.utils import to_satoshi
+from tests import helpers
 
 
 async def test_normal(client, block, address_transaction):
@@ -10,15 +10,17 @@ async def test_normal(client, block, address_transaction):
     print(response.json())
     assert response.status_code == 200
 
-    assert response.json()["pagination"] == {"total": 1, "pages": 1, "page": 1}
+    assert response.json()["pagination"] == {
+        "total": 1,
+        "pages": 1,
+        "page": 1,
+        "cursor": None,
+    }
 
     transaction_data = response.json()["list"][0]
 
     assert transaction_data["blockhash"] == address_transaction.blockhash
-    assert transaction_data["amount"] == {
-        token: to_satoshi(amount)
-        for token, amount in address_transaction.amount.items()
-    }
+    assert transaction_data["amount"] == address_transaction.amount
     assert transaction_data["height"] == address_transaction.height
     assert transaction_data["txid"] == address_transaction.txid
 
@@ -31,5 +33,40 @@ async def test_none(client, address):
     print(response.json())
     assert response.status_code == 200
 
-    assert response.json()["pagination"] == {"total": 0, "pages": 0, "page": 1}
+    assert response.json()["pagination"] == {
+        "total": 0,
+        "pages": 0,
+        "page": 1,
+        "cursor": None,
+    }
     assert response.json()["list"] == []
+
+
+async def test_cursor(client, session, block, address):
+    created = [
+        await helpers.create_transaction(
+            session,
+            addresses=[address.address],
+            height=index // 4,
+            block_index=index % 4,
+        )
+        for index in range(15)
+    ]
+
+    first = await addresses.get_address_transactions(client, address.address)
+    cursor = first.json()["pagination"]["cursor"]
+    assert cursor is not None
+
+    second = await addresses.get_address_transactions(
+        client, address.address, cursor=cursor
+    )
+    assert second.json()["pagination"]["cursor"] is None
+
+    txids = [
+        transaction["txid"]
+        for response in (first, second)
+        for transaction in response.json()["list"]
+    ]
+
+    # Newest first, by height and position in block
+    assert txids == [transaction.txid for transaction in reversed(created)]
@@ -1,5 +1,4 @@
 from tests.client_requests import addresses
-from app.utils import to_satoshi
 
 
 async def test_normal(client, address_utxo):
@@ -15,7 +14,7 @@ async def test_normal(client, address_utxo):
 
     assert utxo["txid"] == address_utxo.txid
     assert utxo["currency"] == address_utxo.currency
-    assert utxo["amount"] == to_satoshi(address_utxo.amount)  # type: ignore
+    assert utxo["amount"] == address_utxo.amount
     assert utxo["timelock"] == address_utxo.timelock
     assert utxo["type"] == address_utxo.type
     assert utxo["spent"] == address_utxo.spent
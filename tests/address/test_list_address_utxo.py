@@ -2,9 +2,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from async_asgi_testclient import TestClient
 from tests.client_requests import addresses
 from app.models.output import Output
-from app.utils import to_satoshi
+from app.constants import COIN
 from tests import helpers
-import secrets
 
 
 async def test_default(client: TestClient, address_utxo: Output, session: AsyncSession):
@@ -15,11 +14,11 @@ async def test_default(client: TestClient, address_utxo: Output, session: AsyncS
         address_utxo.currency,
         address=address_utxo.address,
         spent=False,
-        shortcut=secrets.token_hex(16),
         amount=123,
     )
 
-    required_amount = address_utxo.amount + utxo1.amount + extra_amount
+    # Requested in coins, outputs are stored in satoshis
+    required_amount = (address_utxo.amount + utxo1.amount) / COIN + extra_amount
 
     response = await addresses.get_address_utxo(
         client, address_utxo.address, float(required_amount), "MBC"
@@ -31,10 +30,7 @@ async def test_default(client: TestClient, address_utxo: Output, session: AsyncS
 
     for txo in response.json()["list"]:
         assert txo["timelock"] in (address_utxo.timelock, utxo1.timelock)
-        assert txo["amount"] in (
-            to_satoshi(float(address_utxo.amount)),
-            to_satoshi(float(utxo1.amount)),
-        )
+        assert txo["amount"] in (address_utxo.amount, utxo1.amount)
         assert txo["currency"] in (address_utxo.currency, utxo1.currency)
         assert txo["index"] in (address_utxo.index, utxo1.index)
         assert txo["type"] in (address_utxo.type, utxo1.type)
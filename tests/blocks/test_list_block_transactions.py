@@ -1,5 +1,4 @@
 from tests.client_requests import blocks
-from app.utils import to_satoshi
 
 
 async def test_normal(client, block_transaction):
@@ -9,15 +8,17 @@ async def test_normal(client, block_transaction):
     print(response.json())
     assert response.status_code == 200
 
-    assert response.json()["pagination"] == {"total": 1, "pages": 1, "page": 1}
+    assert response.json()["pagination"] == {
+        "total": 1,
+        "pages": 1,
+        "page": 1,
+        "cursor": None,
+    }
 
     transaction_data = response.json()["list"][0]
 
     assert transaction_data["blockhash"] == block_transaction.blockhash
-    assert transaction_data["amount"] == {
-        token: to_satoshi(amount)
-        for token, amount in block_transaction.amount.items()
-    }
+    assert transaction_data["amount"] == block_transaction.amount
     assert transaction_data["height"] == block_transaction.height
     assert transaction_data["txid"] == block_transaction.txid
 
@@ -27,5 +28,17 @@ async def test_none(client, block):
     print(response.json())
     assert response.status_code == 200
 
-    assert response.json()["pagination"] == {"total": 0, "pages": 0, "page": 1}
+    assert response.json()["pagination"] == {
+        "total": 0,
+        "pages": 0,
+        "page": 1,
+        "cursor": None,
+    }
     assert response.json()["list"] == []
+
+
+async def test_invalid_hash(client, block):
+    response = await blocks.list_block_transactions(client, "not-a-hash")
+    assert response.status_code == 404
+
+    assert response.json()["code"] == "blocks:not_found"
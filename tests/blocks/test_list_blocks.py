@@ -1,5 +1,6 @@
 from tests.client_requests import blocks
 from app.utils import to_timestamp
+from tests import helpers
 
 
 async def test_normal(client, block):
@@ -7,7 +8,12 @@ async def test_normal(client, block):
     print(response.json())
     assert response.status_code == 200
 
-    assert response.json()["pagination"] == {"total": 1, "pages": 1, "page": 1}
+    assert response.json()["pagination"] == {
+        "total": 1,
+        "pages": 1,
+        "page": 1,
+        "cursor": None,
+    }
 
     block_data = response.json()["list"][0]
 
@@ -22,6 +28,52 @@ async def test_none(client):
     print(response.json())
     assert response.status_code == 200
 
-    assert response.json()["pagination"] == {"total": 0, "pages": 0, "page": 1}
+    assert response.json()["pagination"] == {
+        "total": 0,
+        "pages": 0,
+        "page": 1,
+        "cursor": None,
+    }
 
     assert response.json()["list"] == []
+
+
+async def test_cursor(client, session):
+    for height in range(25):
+        await helpers.create_block(session, height=height)
+
+    heights = []
+    cursor = None
+    for _ in range(3):
+        response = await blocks.list_blocks(client, cursor=cursor)
+        assert response.status_code == 200
+
+        heights += [block["height"] for block in response.json()["list"]]
+        cursor = response.json()["pagination"]["cursor"]
+
+        if cursor is None:
+            break
+
+    assert heights == list(reversed(range(25)))
+    assert cursor is None
+
+
+async def test_invalid_cursor(client, block):
+    response = await blocks.list_blocks(client, cursor="not-a-cursor")
+    assert response.status_code == 400
+
+    assert response.json()["code"] == "pagination:invalid_cursor"
+
+
+async def test_cursor_last_full_page(client, session):
+    for height in range(20):
+        await helpers.create_block(session, height=height)
+
+    first = await blocks.list_blocks(client)
+    cursor = first.json()["pagination"]["cursor"]
+    assert cursor is not None
+
+    # Second page is full but nothing follows it
+    second = await blocks.list_blocks(client, cursor=cursor)
+    assert len(second.json()["list"]) == 10
+    assert second.json()["pagination"]["cursor"] is None
@@ -1,3 +1,4 @@
+from .transactions import get_mempool_transactions
 from .transactions import broadcast_transaction
 from .transactions import get_transaction_info
 from .transactions import list_transactions
@@ -8,6 +9,7 @@ from .blocks import list_blocks
 from .blocks import get_block
 
 from .addresses import get_unspent_address_outputs
+from .addresses import get_address_mempool
 from .addresses import get_address_transactions
 from .addresses import get_address_balances
 
@@ -22,6 +24,7 @@ __all__ = [
     "addresses",
     "blocks",
     # ------ Transactions
+    "get_mempool_transactions",
     "broadcast_transaction",
     "get_transaction_info",
     "list_transactions",
@@ -31,6 +34,7 @@ __all__ = [
     "list_blocks",
     "get_block",
     # ------ Addresses
+    "get_address_mempool",
     "get_unspent_address_outputs",
     "get_address_transactions",
     "get_address_balances",
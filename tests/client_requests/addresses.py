@@ -1,3 +1,5 @@
+from typing import Any
+
 from async_asgi_testclient.response import Response
 from async_asgi_testclient import TestClient
 
@@ -22,10 +24,14 @@ async def get_address_utxo(
 
 
 async def get_address_transactions(
-    client: TestClient, address: str, page: int = 1
+    client: TestClient, address: str, page: int = 1, cursor: str | None = None
 ) -> Response:
+    query_string: dict[str, Any] = {"page": page}
+    if cursor:
+        query_string["cursor"] = cursor
+
     return await client.get(
-        f"/address/{address}/transactions", query_string={"page": page}
+        f"/address/{address}/transactions", query_string=query_string
     )
 
 
@@ -33,3 +39,7 @@ async def get_address_balances(
     client: TestClient, address: str, page: int = 1
 ) -> Response:
     return await client.get(f"/address/{address}/balances", query_string={"page": page})
+
+
+async def get_address_mempool(client: TestClient, address: str) -> Response:
+    return await client.get(f"/address/{address}/mempool")
@@ -1,3 +1,5 @@
+from typing import Any
+
 from async_asgi_testclient import TestClient
 
 
@@ -5,10 +7,16 @@ async def get_latest_block(client: TestClient):
     return await client.get("/blocks/latest")
 
 
-async def list_blocks(client: TestClient, page: int = 1):
+async def list_blocks(
+    client: TestClient, page: int = 1, cursor: str | None = None
+):
+    query_string: dict[str, Any] = {"page": page}
+    if cursor:
+        query_string["cursor"] = cursor
+
     return await client.get(
         "/blocks/",
-        query_string={"page": page},
+        query_string=query_string,
     )
 
 
@@ -17,9 +25,13 @@ async def get_block(client: TestClient, blockhash: str):
 
 
 async def list_block_transactions(
-    client: TestClient, blockhash: str, page: int = 1
+    client: TestClient, blockhash: str, page: int = 1, cursor: str | None = None
 ):
+    query_string: dict[str, Any] = {"page": page}
+    if cursor:
+        query_string["cursor"] = cursor
+
     return await client.get(
         f"/blocks/{blockhash}/transactions",
-        query_string={"page": page},
+        query_string=query_string,
     )
@@ -5,14 +5,25 @@ async def get_transaction_info(client: TestClient, txid: str):
     return await client.get(f"/transactions/{txid}")
 
 
-async def list_transactions(client: TestClient, token: str):
+async def list_transactions(
+    client: TestClient, token: str, cursor: str | None = None
+):
     return await client.get(
         f"/transactions/list/{token}",
+        query_string={"cursor": cursor} if cursor else {},
     )
 
 
+async def get_output_spender(client: TestClient, txid: str, index: int | str):
+    return await client.get(f"/transactions/{txid}/outputs/{index}/spender")
+
+
 async def broadcast_transaction(client: TestClient, raw: str):
     return await client.post(
         "/transactions/broadcast",
         query_string={"raw": raw},
     )
+
+
+async def get_mempool_transactions(client: TestClient):
+    return await client.get("/transactions/mempool")
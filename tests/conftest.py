@@ -12,6 +12,8 @@ import pytest
 
 from app.models import Base, Transaction, Block, Address, Output
 from app.database import sessionmanager, get_session
+from app.cache import count_cache, response_cache
+from app.tip import tipholder
 from app.settings import get_settings
 from app import create_app
 from tests import helpers
@@ -23,7 +25,12 @@ test_db = factories.postgresql_proc()
 @pytest.fixture(autouse=True)
 def app():
     with ExitStack():
-        yield create_app(init_db=False)
+        app = create_app(init_db=False)
+
+        # Tests write blocks directly, without notifying about the new tip
+        tipholder.init(ttl=0)
+
+        yield app
 
 
 @pytest.fixture
@@ -77,6 +84,9 @@ async def clean_tables(connection_test):
 
         await session.commit()
 
+    count_cache.clear()
+    await response_cache.clear()
+
 
 @pytest.fixture(scope="function", autouse=True)
 async def session_override(app, connection_test):
@@ -1,9 +1,15 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
 import secrets
 
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import event
 
-from app.models import Transaction, Block, Address, Output
-from app.utils import utcnow, to_timestamp
+from app.models import Transaction, Block, Address, Output, Input
+from app.models import AddressTransaction
+from app.models import MemPoolTransaction, MemPoolOutput, MemPoolInput
+from app.utils import utcnow, to_timestamp, to_satoshi
 
 
 async def create_transaction(
@@ -17,6 +23,7 @@ async def create_transaction(
     blockhash: str | None = None,
     addresses: list[str] | None = None,
     coinbase: bool = False,
+    block_index: int = 0,
 ) -> Transaction:
     if currencies is None:
         currencies = ["MBC"]
@@ -36,13 +43,28 @@ async def create_transaction(
         height=height,
         locktime=locktime,
         version=version,
-        amount=amount,
+        amount={currency: to_satoshi(value) for currency, value in amount.items()},
         coinbase=coinbase,
+        block_index=block_index,
         addresses=addresses or [secrets.token_hex(32), secrets.token_hex(32)],
     )
 
     session.add(transaction)
 
+    # Index written by the sync for address history
+    session.add_all(
+        [
+            AddressTransaction(
+                address=address,
+                txid=transaction.txid,
+                blockhash=transaction.blockhash,
+                height=height,
+                block_index=block_index,
+            )
+            for address in transaction.addresses
+        ]
+    )
+
     await session.commit()
 
     return transaction
@@ -96,7 +118,6 @@ async def create_address(session: AsyncSession) -> Address:
 async def create_output(
     session: AsyncSession,
     currency: str = "MBC",
-    shortcut: str = "aabbccddeeff0011223344",
     blockhash: str = None,
     address: str = None,
     txid: str = None,
@@ -105,20 +126,23 @@ async def create_output(
     type: str = "new_token",
     spent: bool = False,
     index: int = 1,
+    height: int = 1,
 ):
+    txid = txid or secrets.token_hex(32)
+
     output = Output(
         currency=currency,
-        shortcut=shortcut,
         blockhash=blockhash or secrets.token_hex(32),
         address=address or secrets.token_hex(32),
-        txid=txid or secrets.token_hex(32),
-        amount=amount,  # type: ignore
+        txid=txid,
+        amount=to_satoshi(amount),
         timelock=timelock,
         type=type,
         meta={},
         spent=spent,
         script="",
         asm="",
+        height=height,
         index=index,
     )
 
@@ -127,3 +151,213 @@ async def create_output(
     await session.commit()
 
     return output
+
+
+async def create_input(
+    session: AsyncSession,
+    txid: str,
+    output: Output,
+    blockhash: str = None,
+    prevout: bool = True,
+    height: int = 1,
+) -> Input:
+    input_ = Input(
+        blockhash=blockhash or secrets.token_hex(32),
+        txid=txid,
+        source_txid=output.txid,
+        height=height,
+        index=output.index,
+    )
+
+    # Rows synced before prevouts were stored on inputs have them empty
+    if prevout:
+        input_.amount = output.amount
+        input_.currency = output.currency
+        input_.address = output.address
+
+    session.add(input_)
+
+    await session.commit()
+
+    return input_
+
+
+@contextmanager
+def count_queries(session: AsyncSession) -> Iterator[list[str]]:
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = session.bind.sync_engine  # type: ignore
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def build_output(txid: str, index: int, address: str, amount: str):
+    return {
+        "shortcut": f"{txid}:{index}",
+        "blockhash": None,
+        "txid": txid,
+        "address": address,
+        "timelock": 0,
+        "currency": "MBC",
+        "type": "pubkeyhash",
+        "index": index,
+        "amount": to_satoshi(amount),
+        "spent": False,
+        "script": "",
+        "asm": "",
+        "meta": {},
+    }
+
+
+def build_raw_transaction(
+    spent: str | None = None, coinbase: bool = False
+) -> dict[str, Any]:
+    """Transaction in the shape returned by getrawtransaction, with one output
+
+    Spends the `spent` shortcut, nothing when it isn't given
+    """
+    vin: list[dict[str, Any]] = []
+
+    if coinbase:
+        vin.append({"coinbase": "00"})
+
+    elif spent:
+        source_txid, n = spent.split(":")
+        vin.append({"txid": source_txid, "vout": int(n)})
+
+    return {
+        "txid": secrets.token_hex(32),
+        "version": 1,
+        "locktime": 0,
+        "size": 200,
+        "vin": vin,
+        "vout": [
+            {
+                "n": 0,
+                "value": 1.5,
+                "scriptPubKey": {
+                    "type": "pubkeyhash",
+                    "address": secrets.token_hex(16),
+                    "hex": "",
+                    "asm": "",
+                },
+            }
+        ],
+    }
+
+
+def build_block_data(
+    height: int,
+    transactions: list[tuple[list[str], list[tuple[str, str]]]],
+    prev_blockhash: str | None = None,
+) -> dict[str, Any]:
+    """Block data in the shape returned by parser.parse_block
+
+    Each transaction is (spent shortcuts, [(address, amount), ...])
+    """
+    blockhash = secrets.token_hex(32)
+    now = utcnow()
+
+    data: dict[str, Any] = {"transactions": [], "outputs": [], "inputs": []}
+
+    for index, (spent, vouts) in enumerate(transactions):
+        txid = secrets.token_hex(32)
+
+        data["transactions"].append(
+            {
+                "created": now,
+                "addresses": list(set(address for address, _ in vouts)),
+                "blockhash": blockhash,
+                "locktime": 0,
+                "version": 1,
+                "timestamp": to_timestamp(now),
+                "index": index,
+                "coinbase": index == 0,
+                "size": 100,
+                "txid": txid,
+            }
+        )
+
+        for n, (address, amount) in enumerate(vouts):
+            output = build_output(txid, n, address, amount)
+            output["blockhash"] = blockhash
+            data["outputs"].append(output)
+
+        for shortcut in spent:
+            source_txid, n = shortcut.split(":")
+            data["inputs"].append(
+                {
+                    "shortcut": shortcut,
+                    "blockhash": blockhash,
+                    "index": int(n),
+                    "txid": txid,
+                    "source_txid": source_txid,
+                }
+            )
+
+    data["block"] = {
+        "prev_blockhash": prev_blockhash,
+        "created": now,
+        "transactions": [tx["txid"] for tx in data["transactions"]],
+        "blockhash": blockhash,
+        "timestamp": to_timestamp(now),
+        "height": height,
+    }
+
+    return data
+
+
+async def create_mempool_transaction(
+    session: AsyncSession,
+    outputs: list[tuple[str, float]],
+    spent: list[str] | None = None,
+) -> MemPoolTransaction:
+    """Outputs are (address, amount) pairs, spent is a list of shortcuts"""
+    transaction = MemPoolTransaction(
+        txid=secrets.token_hex(32),
+        created=utcnow(),
+        timestamp=None,
+        size=200,
+        locktime=0,
+        version=1,
+    )
+
+    session.add(transaction)
+
+    for index, (address, amount) in enumerate(outputs):
+        session.add(
+            MemPoolOutput(
+                currency="MBC",
+                shortcut=f"{transaction.txid}:{index}",
+                address=address,
+                txid=transaction.txid,
+                amount=to_satoshi(amount),
+                timelock=0,
+                type="pubkeyhash",
+                script="",
+                asm="",
+                index=index,
+                meta={},
+            )
+        )
+
+    for shortcut in spent or []:
+        session.add(
+            MemPoolInput(
+                shortcut=shortcut,
+                txid=transaction.txid,
+                source_txid=shortcut.split(":")[0],
+                index=int(shortcut.split(":")[1]),
+            )
+        )
+
+    await session.commit()
+
+    return transaction
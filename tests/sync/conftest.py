@@ -0,0 +1,52 @@
+import copy
+import secrets
+
+import pytest
+
+from app.sync import chain
+from tests import helpers
+
+
+class FakeChain:
+    def __init__(self):
+        self.blocks: list[dict] = []
+
+    def extend(self, height: int):
+        while len(self.blocks) <= height:
+            prev = self.blocks[-1]["block"]["blockhash"] if self.blocks else None
+            self.blocks.append(
+                helpers.build_block_data(
+                    len(self.blocks),
+                    [([], [(secrets.token_hex(16), "50")])],
+                    prev_blockhash=prev,
+                )
+            )
+
+    def fork(self, height: int):
+        del self.blocks[height:]
+
+    def hash(self, height: int) -> str:
+        return self.blocks[height]["block"]["blockhash"]
+
+    async def parse_block(self, height: int, block_hash: str | None = None):
+        return copy.deepcopy(self.blocks[height])
+
+    async def get_block_hashes(self, heights: list[int]):
+        return {height: self.hash(height) for height in heights}
+
+    async def make_request(self, _: str, request: dict):
+        if request["method"] == "getblockhash":
+            return {"result": self.hash(request["params"][0])}
+
+        return {"result": {"blocks": len(self.blocks) - 1}}
+
+
+@pytest.fixture
+def fake_chain(monkeypatch):
+    fake_chain = FakeChain()
+
+    monkeypatch.setattr(chain, "parse_block", fake_chain.parse_block)
+    monkeypatch.setattr(chain, "get_block_hashes", fake_chain.get_block_hashes)
+    monkeypatch.setattr(chain, "make_request", fake_chain.make_request)
+
+    return fake_chain
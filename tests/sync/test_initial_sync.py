@@ -0,0 +1,68 @@
+from sqlalchemy import text
+import pytest
+
+from app.sync.initial import (
+    create_secondary_indexes,
+    drop_secondary_indexes,
+    secondary_indexes,
+    lock_initial_sync,
+    ensure_exclusive,
+)
+from app.database import sessionmanager, ensure_no_initial_sync, INITIAL_SYNC_LOCK
+
+
+async def index_names(connection) -> set[str]:
+    return set(
+        await connection.scalars(
+            text("SELECT indexname FROM pg_indexes WHERE schemaname = 'public'")
+        )
+    )
+
+
+async def test_rebuild_indexes():
+    names = {index.name for index in secondary_indexes()}
+
+    assert "ix_service_outputs_address" in names
+    assert "ix_service_address_transactions_address_height" in names
+    assert "ix_service_outputs_txid_index" not in names
+
+    async with sessionmanager.autocommit() as connection:
+        before = await index_names(connection)
+        assert names <= before
+
+        await drop_secondary_indexes(connection)
+        assert await index_names(connection) == before - names
+
+        await create_secondary_indexes(connection)
+        assert await index_names(connection) == before
+
+
+async def test_refuse_shared_database(session):
+    # Another client holds a connection to the same database
+    await session.execute(text("SELECT 1"))
+
+    async with sessionmanager.autocommit() as connection:
+        with pytest.raises(Exception, match="in use"):
+            await ensure_exclusive(connection)
+
+
+async def test_initial_sync_lock():
+    # Nothing holds the lock, API and sync can start
+    await ensure_no_initial_sync()
+
+    async with sessionmanager.autocommit() as connection:
+        await lock_initial_sync(connection)
+
+        try:
+            with pytest.raises(Exception, match="running"):
+                await ensure_no_initial_sync()
+
+            async with sessionmanager.autocommit() as other:
+                with pytest.raises(Exception, match="already running"):
+                    await lock_initial_sync(other)
+        finally:
+            await connection.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": INITIAL_SYNC_LOCK}
+            )
+
+    await ensure_no_initial_sync()
@@ -0,0 +1,141 @@
+from sqlalchemy.exc import MultipleResultsFound
+from sqlalchemy import select, func, text
+import pytest
+
+from app.sync.partitions import partition_bounds, partition_tables
+from app.transactions.service import get_output
+from app.models import Base, Output
+from app.database import sessionmanager
+from app.settings import get_settings
+from app.sync import chain
+from tests import helpers
+
+
+@pytest.fixture
+async def partitioned(session):
+    yield
+
+    # Release the test session locks before dropping the tables
+    await session.close()
+
+    # Back to the plain tables the rest of the suite runs on
+    tables = [
+        Base.metadata.tables[name]
+        for name in ("service_transactions", "service_outputs", "service_inputs")
+    ]
+
+    async with sessionmanager.connect() as connection:
+        for table in tables:
+            await connection.execute(text(f"DROP TABLE {table.name} CASCADE"))
+
+        await connection.run_sync(Base.metadata.create_all, tables=tables)
+
+
+async def partitions(session, table: str) -> list[str]:
+    return list(
+        await session.scalars(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = CAST(:table AS regclass) "
+                "ORDER BY child.relname"
+            ),
+            {"table": table},
+        )
+    )
+
+
+async def test_partition_tables(session, partitioned):
+    block = await helpers.create_block(session, height=25)
+    transaction = await helpers.create_transaction(
+        session, blockhash=block.blockhash, height=25
+    )
+    output = await helpers.create_output(
+        session, txid=transaction.txid, blockhash=block.blockhash, height=25
+    )
+    await helpers.create_input(
+        session, transaction.txid, output, blockhash=block.blockhash, height=25
+    )
+
+    async with sessionmanager.connect() as connection:
+        await partition_tables(connection, 10)
+
+        # Converting twice is a no-op
+        await partition_tables(connection, 10)
+
+    assert await partition_bounds(session) == {
+        "service_transactions": 40,
+        "service_outputs": 40,
+        "service_inputs": 40,
+    }
+    assert await partitions(session, "service_outputs") == [
+        "service_outputs_h0",
+        "service_outputs_h10",
+        "service_outputs_h20",
+        "service_outputs_h30",
+    ]
+
+    session.expunge_all()
+
+    # Rows are kept and lookups still work through the parent table
+    stored = await session.scalar(
+        select(Output).filter(Output.txid == output.txid, Output.index == 1)
+    )
+    assert stored.id == output.id
+    assert stored.height == 25
+
+    assert await session.scalar(
+        text("SELECT count(*) FROM service_outputs_h20")
+    ) == 1
+
+
+async def test_sync_creates_partitions(session, partitioned, fake_chain):
+    settings = get_settings()
+    previous = settings.get("sync", {})
+    settings.set("sync.partition_size", 10)
+
+    try:
+        async with sessionmanager.connect() as connection:
+            await partition_tables(connection, 10)
+
+        fake_chain.extend(35)
+        await chain.sync_chain()
+
+        # Reorged block rows are removed from their partition
+        fake_chain.fork(33)
+        fake_chain.extend(36)
+        await chain.sync_chain()
+    finally:
+        settings.set("sync", previous)
+
+    # A whole partition stays ahead of the tip
+    assert await partition_bounds(session) == {
+        "service_transactions": 50,
+        "service_outputs": 50,
+        "service_inputs": 50,
+    }
+    assert await session.scalar(select(func.count(Output.id))) == 37
+    assert await session.scalar(
+        text("SELECT count(*) FROM service_outputs_h30")
+    ) == 7
+
+
+async def test_single_output_lookups(session, partitioned):
+    output = await helpers.create_output(session, index=0, height=5)
+
+    async with sessionmanager.connect() as connection:
+        await partition_tables(connection, 10)
+
+    stored = await get_output(session, output.txid, 0)
+    assert stored.id == output.id
+    shortcut = f"{output.txid}:0"
+    assert list(await chain.load_prevouts(session, [shortcut])) == [shortcut]
+
+    # Outpoint is no longer unique across partitions, duplicates are caught
+    await helpers.create_output(session, txid=output.txid, index=0, height=15)
+
+    with pytest.raises(MultipleResultsFound):
+        await get_output(session, output.txid, 0)
+
+    with pytest.raises(Exception, match="more than once"):
+        await chain.load_prevouts(session, [shortcut])
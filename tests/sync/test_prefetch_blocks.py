@@ -0,0 +1,56 @@
+from contextlib import aclosing
+import asyncio
+import random
+
+from app.sync import chain
+
+
+async def fake_get_block_hashes(heights: list[int]):
+    return {height: f"hash-{height}" for height in heights}
+
+
+async def fake_parse_block(height: int, block_hash: str):
+    # Finish out of order to make sure the window still yields in order
+    await asyncio.sleep(random.random() / 100)
+    assert block_hash == f"hash-{height}"
+    return {"block": {"height": height}}
+
+
+async def test_order(monkeypatch):
+    monkeypatch.setattr(chain, "get_block_hashes", fake_get_block_hashes)
+    monkeypatch.setattr(chain, "parse_block", fake_parse_block)
+
+    heights = [
+        block_data["block"]["height"]
+        async for block_data in chain.prefetch_blocks(1, 50, 8)
+    ]
+
+    assert heights == list(range(1, 51))
+
+
+async def test_window_drained(monkeypatch):
+    started: list[int] = []
+    cancelled: list[int] = []
+
+    async def slow_parse_block(height: int, block_hash: str):
+        started.append(height)
+        try:
+            if height > 1:
+                await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(height)
+            raise
+
+        return {"block": {"height": height}}
+
+    monkeypatch.setattr(chain, "get_block_hashes", fake_get_block_hashes)
+    monkeypatch.setattr(chain, "parse_block", slow_parse_block)
+
+    async with aclosing(chain.prefetch_blocks(1, 100, 4)) as blocks:
+        async for block_data in blocks:
+            assert block_data["block"]["height"] == 1
+            break
+
+    # Window never grows past its size and is cancelled on early exit
+    assert started == [1, 2, 3, 4]
+    assert sorted(cancelled) == [2, 3, 4]
@@ -0,0 +1,172 @@
+import secrets
+
+from sqlalchemy import select, func
+import pytest
+
+from app.models import AddressBalance, Address, Output, Input, Transaction
+from app.models import AddressTransaction
+from app.sync.chain import process_block, process_reorg
+from app.settings import get_settings
+from app.constants import COIN
+from app import constants
+from tests import helpers
+
+
+@pytest.fixture(params=[True, False], ids=["bulk", "orm"], autouse=True)
+def bulk_insert(request):
+    settings = get_settings()
+    previous = settings.get("sync.bulk_insert", constants.DEFAULT_SYNC_BULK_INSERT)
+
+    settings.set("sync.bulk_insert", request.param)
+    yield request.param
+    settings.set("sync.bulk_insert", previous)
+
+
+async def get_balance(session, address: str) -> int | None:
+    return await session.scalar(
+        select(AddressBalance.balance).filter(
+            AddressBalance.address_id == Address.id,
+            Address.address == address,
+        )
+    )
+
+
+async def test_local_prevouts(session):
+    sender = secrets.token_hex(16)
+    receiver = secrets.token_hex(16)
+
+    prevout = await helpers.create_output(
+        session, txid="aa" * 32, index=0, address=sender, amount=10.0
+    )
+
+    # Spends a stored output and an output of an earlier tx in the same block
+    data = helpers.build_block_data(
+        1,
+        [
+            ([], [(sender, "1")]),
+            ([prevout.txid + ":0"], [(receiver, "4"), (sender, "6")]),
+        ],
+    )
+    data["transactions"][1]["index"] = 1
+    change = data["outputs"][0]["shortcut"]
+    data["inputs"].append(
+        {
+            "shortcut": change,
+            "blockhash": data["block"]["blockhash"],
+            "index": 0,
+            "txid": data["transactions"][1]["txid"],
+            "source_txid": change.split(":")[0],
+        }
+    )
+
+    block = await process_block(session, data)
+    await session.commit()
+
+    assert block.movements == {"MBC": {sender: -4 * COIN, receiver: 4 * COIN}}
+
+    assert await get_balance(session, sender) == -4 * COIN
+    assert await get_balance(session, receiver) == 4 * COIN
+
+    # Both spent outputs point at the spending transaction
+    spent = await session.execute(
+        select(
+            Output.txid, Output.index, Output.spent_txid, Output.spent_height
+        ).filter(Output.spent)
+    )
+    assert sorted(spent) == sorted(
+        [
+            (prevout.txid, 0, data["transactions"][1]["txid"], 1),
+            (data["transactions"][0]["txid"], 0, data["transactions"][1]["txid"], 1),
+        ]
+    )
+
+    assert await session.scalar(select(func.count(Input.id))) == 2
+    assert await session.scalar(select(func.count(Transaction.id))) == 2
+
+    # Prevouts are stored on the inputs
+    inputs = await session.execute(
+        select(
+            Input.source_txid, Input.index, Input.address, Input.amount, Input.currency
+        )
+    )
+    assert sorted(inputs) == sorted(
+        [
+            (prevout.txid, 0, sender, 10 * COIN, "MBC"),
+            (data["transactions"][0]["txid"], 0, sender, 1 * COIN, "MBC"),
+        ]
+    )
+
+
+async def test_reorg(session):
+    sender = secrets.token_hex(16)
+    receiver = secrets.token_hex(16)
+
+    first = helpers.build_block_data(1, [([], [(sender, "10")])])
+    await process_block(session, first)
+
+    prevout = first["outputs"][0]["shortcut"]
+    second = helpers.build_block_data(
+        2,
+        [([], [(sender, "1")]), ([prevout], [(receiver, "3"), (sender, "7")])],
+        prev_blockhash=first["block"]["blockhash"],
+    )
+    block = await process_block(session, second)
+    await session.commit()
+
+    assert await get_balance(session, sender) == 8 * COIN
+    assert await get_balance(session, receiver) == 3 * COIN
+
+    latest = await process_reorg(session, block)
+    await session.commit()
+
+    assert latest.blockhash == first["block"]["blockhash"]
+
+    assert await get_balance(session, sender) == 10 * COIN
+    assert await get_balance(session, receiver) == 0
+
+    assert await session.scalar(select(func.count(Transaction.id))) == 1
+    assert await session.scalar(select(func.count(Input.id))) == 0
+
+    # Output spent by the removed block is unspent again
+    restored = await session.execute(
+        select(Output.spent, Output.spent_txid, Output.spent_height).filter(
+            Output.txid == first["outputs"][0]["txid"], Output.index == 0
+        )
+    )
+    assert restored.one() == (False, None, None)
+
+
+async def test_address_transactions(session):
+    sender = secrets.token_hex(16)
+    receiver = secrets.token_hex(16)
+
+    first = helpers.build_block_data(1, [([], [(sender, "10")])])
+    await process_block(session, first)
+
+    # Sender only spends in this transaction, it has no output to its address
+    prevout = first["outputs"][0]["shortcut"]
+    second = helpers.build_block_data(
+        2,
+        [([], [(receiver, "1")]), ([prevout], [(receiver, "10")])],
+        prev_blockhash=first["block"]["blockhash"],
+    )
+    block = await process_block(session, second)
+    await session.commit()
+
+    async def history(address: str) -> list[tuple[int, int]]:
+        return list(
+            await session.execute(
+                select(AddressTransaction.height, AddressTransaction.block_index)
+                .filter(AddressTransaction.address == address)
+                .order_by(AddressTransaction.height, AddressTransaction.block_index)
+            )
+        )
+
+    assert await history(sender) == [(1, 0), (2, 1)]
+    assert await history(receiver) == [(2, 0), (2, 1)]
+
+    await process_reorg(session, block)
+    await session.commit()
+
+    assert await history(sender) == [(1, 0)]
+    assert await history(receiver) == []
@@ -0,0 +1,69 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+import pytest
+
+from app.models import Block, Transaction
+from app.settings import get_settings
+from app.sync import chain
+
+
+@pytest.fixture
+def commits(monkeypatch):
+    commits: list[int] = []
+    commit = AsyncSession.commit
+
+    async def counting_commit(self):
+        commits.append(1)
+        await commit(self)
+
+    monkeypatch.setattr(AsyncSession, "commit", counting_commit)
+
+    return commits
+
+
+@pytest.fixture(autouse=True)
+def sync_settings():
+    settings = get_settings()
+    previous = settings.get("sync", {})
+
+    settings.set("sync.prefetch", 4)
+    settings.set("sync.commit_blocks", 10)
+    settings.set("sync.commit_rows", 1000)
+    settings.set("sync.tip_distance", 5)
+    yield
+    settings.set("sync", previous)
+
+
+async def chain_hashes(session) -> list[str]:
+    return list(
+        await session.scalars(select(Block.blockhash).order_by(Block.height))
+    )
+
+
+async def test_catch_up_batches(session, fake_chain, commits):
+    fake_chain.extend(40)
+
+    await chain.sync_chain()
+
+    assert await chain_hashes(session) == [
+        fake_chain.hash(height) for height in range(41)
+    ]
+    assert await session.scalar(select(func.count(Transaction.id))) == 41
+
+    # Genesis, every 10 blocks up to 30, then every block near the tip
+    assert len(commits) == 1 + 3 + 5
+
+
+async def test_resume_and_reorg(session, fake_chain):
+    fake_chain.extend(20)
+    await chain.sync_chain()
+
+    # Chain grows with blocks 18 and up replaced
+    fake_chain.fork(18)
+    fake_chain.extend(30)
+    await chain.sync_chain()
+
+    assert await chain_hashes(session) == [
+        fake_chain.hash(height) for height in range(31)
+    ]
+    assert await session.scalar(select(func.count(Transaction.id))) == 31
@@ -0,0 +1,115 @@
+from collections.abc import Sequence
+from typing import Any
+import time
+import gc
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+
+from app.transactions.service import load_mempool_transactions
+from app.models import MemPoolTransaction, MemPoolOutput, MemPoolInput
+from app.sync.mempool import sync_mempool
+from app import parser
+from tests import helpers
+
+
+class FakeMempool:
+    def __init__(self):
+        self.transactions: dict[str, dict[str, Any]] = {}
+        self.fetched: list[str] = []
+
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        if request["method"] == "getrawmempool":
+            result: Any = list(self.transactions)
+
+        else:
+            self.fetched.append(request["params"][0])
+            result = self.transactions[request["params"][0]]
+
+        return {"id": request["id"], "result": result, "error": None}
+
+    async def make_request(self, _: str, requests=None):
+        if isinstance(requests, list):
+            return [self.handle(request) for request in requests]
+
+        return self.handle(requests)
+
+
+async def test_incremental(session, monkeypatch):
+    node = FakeMempool()
+    monkeypatch.setattr(parser, "make_request", node.make_request)
+
+    first, second = helpers.build_raw_transaction(), helpers.build_raw_transaction()
+    node.transactions = {tx["txid"]: tx for tx in (first, second)}
+
+    await sync_mempool()
+    assert sorted(node.fetched) == sorted([first["txid"], second["txid"]])
+
+    # First one got confirmed, a new one spends the second
+    third = helpers.build_raw_transaction(spent=second["txid"] + ":0")
+    node.transactions = {tx["txid"]: tx for tx in (second, third)}
+    node.fetched = []
+
+    await sync_mempool()
+    assert node.fetched == [third["txid"]]
+
+    assert set(await session.scalars(select(MemPoolTransaction.txid))) == {
+        second["txid"],
+        third["txid"],
+    }
+    assert set(await session.scalars(select(MemPoolOutput.shortcut))) == {
+        second["txid"] + ":0",
+        third["txid"] + ":0",
+    }
+    assert list(
+        await session.execute(select(MemPoolInput.txid, MemPoolInput.shortcut))
+    ) == [(third["txid"], second["txid"] + ":0")]
+
+    # Nothing changed, nothing is fetched
+    node.fetched = []
+    await sync_mempool()
+    assert node.fetched == []
+
+
+def build_mempool(size: int) -> list[dict[str, Any]]:
+    previous = [helpers.build_raw_transaction() for _ in range(size // 2)]
+
+    # Half of the transactions spend outputs of the other half
+    return previous + [helpers.build_raw_transaction(spent=tx["txid"] + ":0") for tx in previous]
+
+
+async def timed_load(
+    session: AsyncSession, transactions: Sequence[MemPoolTransaction]
+) -> float:
+    gc.collect()
+
+    start = time.perf_counter()
+    result = await load_mempool_transactions(session, transactions)
+    elapsed = time.perf_counter() - start
+
+    assert len(result) == len(transactions)
+
+    return elapsed
+
+
+async def test_large_mempool(session, monkeypatch):
+    node = FakeMempool()
+    monkeypatch.setattr(parser, "make_request", node.make_request)
+
+    node.transactions = {tx["txid"]: tx for tx in build_mempool(50_000)}
+    await sync_mempool()
+
+    transactions = (await session.scalars(select(MemPoolTransaction))).all()
+    assert len(transactions) == 50_000
+
+    small = transactions[:5_000]
+
+    # Warm up before measuring
+    await timed_load(session, small)
+
+    # Noise only slows a run down, one pass over the large mempool is enough
+    small_time = min([await timed_load(session, small) for _ in range(3)])
+    large_time = await timed_load(session, transactions)
+
+    # 10x bigger mempool, grouping must stay far below the quadratic 100x
+    assert large_time / small_time < 50
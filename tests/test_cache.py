@@ -0,0 +1,87 @@
+from app.blocks.service import count_blocks
+from app.transactions.service import count_transactions
+from app.cache import count_cache
+from tests.client_requests import transactions, blocks
+from tests import helpers
+
+
+async def test_cached_until_tip_changes(session, block):
+    await helpers.create_transaction(session)
+
+    assert await count_transactions(session, "mbc") == 1
+
+    # Rows written without a new block are not counted yet
+    await helpers.create_transaction(session)
+    assert await count_transactions(session, "mbc") == 1
+
+    await helpers.create_block(session, height=block.height + 1)
+    assert await count_transactions(session, "mbc") == 2
+    assert await count_blocks(session) == 2
+
+
+async def test_size(session, block):
+    count_cache.init(size=1)
+
+    try:
+        await helpers.create_transaction(session, currencies=["MBC"])
+        await helpers.create_transaction(session, currencies=["TEST"])
+
+        assert await count_transactions(session, "mbc") == 1
+        assert await count_transactions(session, "test") == 1
+
+        # Oldest entry is evicted and counted again
+        await helpers.create_transaction(session, currencies=["MBC"])
+        assert await count_transactions(session, "mbc") == 2
+
+    finally:
+        count_cache.init()
+
+
+async def test_response_cache(client, session, block):
+    transaction = await helpers.create_transaction(session, blockhash=block.blockhash)
+
+    response = await transactions.get_transaction_info(client, transaction.txid)
+    assert response.status_code == 200
+    assert response.json()["confirmations"] == 0
+
+    # Served from cache until the tip moves
+    transaction.height = 0
+    await session.commit()
+
+    cached = await transactions.get_transaction_info(client, transaction.txid)
+    assert cached.json()["confirmations"] == 0
+    assert cached.headers["etag"] == response.headers["etag"]
+
+    await helpers.create_block(session, height=block.height + 1)
+
+    response = await transactions.get_transaction_info(client, transaction.txid)
+    assert response.json()["confirmations"] == 2
+    assert response.headers["etag"] != cached.headers["etag"]
+
+
+async def test_etag(client, block):
+    response = await blocks.get_block(client, block.blockhash)
+    assert response.status_code == 200
+
+    etag = response.headers["etag"]
+
+    response = await client.get(
+        f"/blocks/{block.blockhash}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+
+async def test_errors_not_cached(client, session, block):
+    txid = "aa" * 32
+
+    missing = await transactions.get_transaction_info(client, txid)
+    assert missing.status_code == 404
+
+    # Same tip, but the error response was not kept
+    transaction = await helpers.create_transaction(session, blockhash=block.blockhash)
+    transaction.txid = txid
+    await session.commit()
+
+    response = await transactions.get_transaction_info(client, txid)
+    assert response.status_code == 200
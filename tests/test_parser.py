@@ -0,0 +1,163 @@
+from typing import Any
+import secrets
+import time
+import gc
+
+import pytest
+
+from app import parser
+from tests import helpers
+
+
+def build_transactions(count: int) -> list[dict[str, Any]]:
+    # Coinbase first, the rest spend outputs the node doesn't know about
+    return [helpers.build_raw_transaction(coinbase=True)] + [
+        helpers.build_raw_transaction(spent=secrets.token_hex(32) + ":0")
+        for _ in range(count - 1)
+    ]
+
+
+class FakeNode:
+    def __init__(self, transactions: int, verbose_blocks: bool = True):
+        self.verbose_blocks = verbose_blocks
+        self.verbose_error: dict[str, Any] | None = None
+        self.methods: list[str] = []
+        self.block = {
+            "hash": secrets.token_hex(32),
+            "previousblockhash": secrets.token_hex(32),
+            "height": 5,
+            "time": 1700000000,
+            "tx": build_transactions(transactions),
+        }
+
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        self.methods.append(request["method"])
+        params = request["params"]
+        result: Any = None
+
+        if request["method"] == "getblockhash":
+            result = self.block["hash"]
+
+        elif request["method"] == "getblock":
+            if len(params) == 1:
+                result = {
+                    **self.block,
+                    "tx": [tx["txid"] for tx in self.block["tx"]],
+                }
+
+            elif self.verbose_error is not None:
+                error = self.verbose_error
+                return {"id": request["id"], "result": None, "error": error}
+
+            elif self.verbose_blocks:
+                result = {**self.block}
+
+            else:
+                error = {"code": -8, "message": "Verbosity must be 0 or 1"}
+                return {"id": request["id"], "result": None, "error": error}
+
+        elif request["method"] == "getrawtransaction":
+            result = {
+                **next(tx for tx in self.block["tx"] if tx["txid"] == params[0]),
+                "blockhash": self.block["hash"],
+                "time": self.block["time"],
+            }
+
+        return {"id": request["id"], "result": result, "error": None}
+
+    async def make_request(self, _: str, requests=None):
+        if isinstance(requests, list):
+            # Nodes answer batches in any order
+            return [self.handle(request) for request in reversed(requests)]
+
+        return self.handle(requests)
+
+
+@pytest.fixture
+def node(request, monkeypatch):
+    node = FakeNode(transactions=3, verbose_blocks=request.param)
+
+    monkeypatch.setattr(parser, "make_request", node.make_request)
+    monkeypatch.setattr(parser, "capabilities", {})
+
+    return node
+
+
+@pytest.mark.parametrize("node", [True, False], indirect=True)
+async def test_parse_block(node):
+    result = await parser.parse_block(5)
+
+    txids = [tx["txid"] for tx in node.block["tx"]]
+
+    assert result["block"]["blockhash"] == node.block["hash"]
+    assert result["block"]["transactions"] == txids
+
+    transactions = sorted(result["transactions"], key=lambda tx: tx["index"])
+
+    assert [tx["txid"] for tx in transactions] == txids
+    assert [tx["coinbase"] for tx in transactions] == [True, False, False]
+    assert all(tx["blockhash"] == node.block["hash"] for tx in result["transactions"])
+
+    assert len(result["outputs"]) == 3
+    assert len(result["inputs"]) == 2
+
+    if node.verbose_blocks:
+        assert node.methods == ["getblockhash", "getblock"]
+    else:
+        assert "getrawtransaction" in node.methods
+        assert parser.capabilities == {"verbose_blocks": False}
+
+
+@pytest.mark.parametrize("node", [True], indirect=True)
+async def test_parse_block_transient_error(node):
+    # Node still loading its block index
+    node.verbose_error = {"code": -28, "message": "Loading block index..."}
+
+    result = await parser.parse_block(5)
+
+    assert result["block"]["blockhash"] == node.block["hash"]
+    assert "getrawtransaction" in node.methods
+    assert parser.capabilities == {}
+
+    # Next block probes verbosity 2 again
+    node.verbose_error = None
+    node.methods.clear()
+
+    await parser.parse_block(5)
+
+    assert node.methods == ["getblockhash", "getblock"]
+    assert parser.capabilities == {"verbose_blocks": True}
+
+
+@pytest.mark.parametrize("node", [True], indirect=True)
+async def test_parse_block_known_hash(node):
+    await parser.parse_block(5, node.block["hash"])
+
+    assert node.methods == ["getblock"]
+
+
+async def timed_parse(transactions: list[dict[str, Any]]) -> float:
+    txids = [tx["txid"] for tx in transactions]
+    gc.collect()
+
+    start = time.perf_counter()
+    result = await parser.parse_transactions_data(txids, list(reversed(transactions)))
+    elapsed = time.perf_counter() - start
+
+    assert result["transactions"][0]["index"] == len(transactions) - 1
+
+    return elapsed
+
+
+async def test_parse_scales_linearly():
+    small = build_transactions(2_000)
+    large = build_transactions(20_000)
+
+    # Warm up before measuring
+    await timed_parse(small)
+
+    small_time = min([await timed_parse(small) for _ in range(3)])
+    large_time = min([await timed_parse(large) for _ in range(3)])
+
+    # 10x more transactions, linear parse stays far below the quadratic 100x
+    assert large_time / small_time < 50
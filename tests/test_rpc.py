@@ -0,0 +1,81 @@
+from aiohttp import web, ClientResponseError
+import pytest
+
+from app.rpc import RPCClient
+
+
+@pytest.fixture
+async def node():
+    state = {"requests": 0, "busy": 0, "peers": set()}
+
+    async def handle(request: web.Request):
+        state["requests"] += 1
+        state["peers"].add(request.transport.get_extra_info("peername"))
+
+        # Emulate node replying with a full work queue
+        if state["busy"]:
+            state["busy"] -= 1
+            return web.Response(status=503, text="Work queue depth exceeded")
+
+        body = await request.json()
+        return web.json_response({"id": body["id"], "result": "ok", "error": None})
+
+    app = web.Application()
+    app.router.add_post("/", handle)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore
+    state["endpoint"] = f"http://127.0.0.1:{port}/"
+
+    yield state
+
+    await runner.cleanup()
+
+
+@pytest.fixture
+async def client():
+    client = RPCClient()
+    client.init(backoff=0)
+    yield client
+    await client.close()
+
+
+async def test_keepalive(client, node):
+    for _ in range(5):
+        response = await client.request(node["endpoint"], {"id": "test"})
+        assert response["result"] == "ok"
+
+    # All requests went over the same pooled connection
+    assert node["requests"] == 5
+    assert len(node["peers"]) == 1
+
+
+async def test_retry(client, node):
+    node["busy"] = 2
+
+    response = await client.request(node["endpoint"], {"id": "test"})
+
+    assert response["result"] == "ok"
+    assert node["requests"] == 3
+
+
+async def test_retries_exhausted(client, node):
+    node["busy"] = client.retries + 1
+
+    with pytest.raises(ClientResponseError):
+        await client.request(node["endpoint"], {"id": "test"})
+
+    assert node["requests"] == client.retries + 1
+
+
+async def test_no_retry(client, node):
+    node["busy"] = 1
+
+    with pytest.raises(ClientResponseError):
+        await client.request(node["endpoint"], {"id": "test"}, retry=False)
+
+    assert node["requests"] == 1
@@ -0,0 +1,50 @@
+import asyncio
+
+from app.tip import tipholder, notify_tip
+from tests import helpers
+
+
+async def test_ttl(session, block):
+    tipholder.init(ttl=60)
+
+    assert (await tipholder.get(session)).blockhash == block.blockhash
+
+    # Reused until expired or invalidated
+    new = await helpers.create_block(session, height=block.height + 1)
+    assert (await tipholder.get(session)).blockhash == block.blockhash
+
+    tipholder.invalidate()
+    assert (await tipholder.get(session)).blockhash == new.blockhash
+
+
+async def test_notify(session, block):
+    tipholder.start()
+
+    try:
+        # Wait for LISTEN to be set up
+        for _ in range(50):
+            if tipholder.listening:
+                break
+
+            await asyncio.sleep(0.1)
+
+        assert tipholder.listening
+
+        assert (await tipholder.get(session)).blockhash == block.blockhash
+
+        new = await helpers.create_block(session, height=block.height + 1)
+        assert (await tipholder.get(session)).blockhash == block.blockhash
+
+        await notify_tip(session)
+        await session.commit()
+
+        for _ in range(50):
+            if (await tipholder.get(session)).blockhash == new.blockhash:
+                break
+
+            await asyncio.sleep(0.1)
+
+        assert (await tipholder.get(session)).blockhash == new.blockhash
+
+    finally:
+        await tipholder.close()
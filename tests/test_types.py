@@ -0,0 +1,65 @@
+from sqlalchemy.exc import StatementError
+from sqlalchemy import select, func
+import pytest
+
+from app.models.base import uuid7
+from app.models import Output
+from tests import helpers
+
+
+async def test_binary_storage(session):
+    output = await helpers.create_output(session, index=7)
+    output.script = "76a914" + "00" * 20 + "88ac"
+    await session.commit()
+
+    sizes = (
+        await session.execute(
+            select(
+                func.octet_length(Output.txid),
+                func.octet_length(Output.blockhash),
+                func.octet_length(Output.script),
+            )
+        )
+    ).one()
+
+    # Raw bytes instead of hex text
+    assert tuple(sizes) == (32, 32, 25)
+
+    session.expunge_all()
+
+    stored = await session.scalar(
+        select(Output).filter(Output.txid == output.txid, Output.index == 7)
+    )
+    assert stored.txid == output.txid
+    assert stored.script == output.script
+
+
+async def test_invalid_hex(session):
+    output = await helpers.create_output(session)
+
+    # Malformed values are rejected instead of being stored as NULL
+    for column, value in [
+        ("txid", "not-hex"),
+        ("blockhash", "abc"),
+        ("script", "zz"),
+    ]:
+        setattr(output, column, value)
+
+        with pytest.raises(StatementError, match="Invalid"):
+            await session.commit()
+
+        await session.rollback()
+
+
+async def test_sequential_ids(session):
+    ids = [uuid7() for _ in range(10000)]
+
+    assert all(value.version == 7 for value in ids)
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+
+    first = await helpers.create_output(session, index=0)
+    second = await helpers.create_output(session, index=1)
+
+    assert first.id < second.id
+    assert first.reference == str(first.id)
@@ -0,0 +1,61 @@
+import pytest
+
+from app.transactions.service import load_mempool_transactions
+from tests.client_requests import transactions
+from app.utils import to_satoshi
+from tests import helpers
+
+
+async def test_none(client):
+    response = await transactions.get_mempool_transactions(client)
+    print(response.json())
+    assert response.status_code == 200
+
+    assert response.json() == []
+
+
+async def test_normal(client, session, address):
+    confirmed = await helpers.create_output(
+        session, txid="aa" * 32, index=1, address=address.address, amount=10.0
+    )
+
+    first = await helpers.create_mempool_transaction(
+        session, [("receiver", 6.0), (address.address, 3.5)], [confirmed.txid + ":1"]
+    )
+    # Spends an unconfirmed output
+    second = await helpers.create_mempool_transaction(
+        session, [("receiver", 3.0)], [first.txid + ":1"]
+    )
+
+    response = await transactions.get_mempool_transactions(client)
+    print(response.json())
+    assert response.status_code == 200
+
+    data = {transaction["txid"]: transaction for transaction in response.json()}
+    assert set(data) == {first.txid, second.txid}
+
+    assert data[first.txid]["amount"] == {"MBC": to_satoshi(9.5)}
+    assert data[first.txid]["fee"] == to_satoshi(0.5)
+    assert data[first.txid]["confirmations"] == 0
+    assert data[first.txid]["height"] is None
+    assert [output["index"] for output in data[first.txid]["outputs"]] == [0, 1]
+    assert data[first.txid]["inputs"] == [
+        {
+            "amount": to_satoshi(10.0),
+            "units": 8,
+            "currency": "MBC",
+            "address": address.address,
+        }
+    ]
+
+    assert data[second.txid]["fee"] == to_satoshi(0.5)
+    assert data[second.txid]["inputs"][0]["address"] == address.address
+
+
+async def test_unknown_prevout(session):
+    transaction = await helpers.create_mempool_transaction(
+        session, [("receiver", 1.0)], ["bb" * 32 + ":0"]
+    )
+
+    with pytest.raises(Exception, match="not stored"):
+        await load_mempool_transactions(session, [transaction])
@@ -0,0 +1,46 @@
+import secrets
+
+from sqlalchemy import update
+
+from tests.client_requests import transactions
+from app.models import Output
+from tests import helpers
+
+
+async def test_spent(client, session):
+    output = await helpers.create_output(session, index=3, spent=True)
+    spender = secrets.token_hex(32)
+
+    await session.execute(
+        update(Output)
+        .filter(Output.id == output.id)
+        .values(spent_txid=spender, spent_height=12)
+    )
+    await session.commit()
+
+    response = await transactions.get_output_spender(client, output.txid, 3)
+    assert response.status_code == 200
+
+    assert response.json() == {"spent": True, "txid": spender, "height": 12}
+
+
+async def test_unspent(client, session):
+    output = await helpers.create_output(session, index=0)
+
+    response = await transactions.get_output_spender(client, output.txid, 0)
+    assert response.status_code == 200
+
+    assert response.json() == {"spent": False, "txid": None, "height": None}
+
+
+async def test_not_found(client, session):
+    output = await helpers.create_output(session, index=0)
+
+    for txid, index in [(output.txid, 1), (secrets.token_hex(32), 0), ("xyz", 0)]:
+        response = await transactions.get_output_spender(client, txid, index)
+        assert response.status_code == 404
+
+        assert response.json()["code"] == "outputs:not_found"
+
+    response = await transactions.get_output_spender(client, output.txid, 2**32)
+    assert response.status_code == 400
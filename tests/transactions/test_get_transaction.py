@@ -1,5 +1,7 @@
+from app.transactions.service import get_transaction_by_txid
 from tests.client_requests import transactions
-from app.utils import to_satoshi
+from app.constants import COIN
+from tests import helpers
 
 
 async def test_normal(client, transaction, block):
@@ -10,10 +12,7 @@ async def test_normal(client, transaction, block):
     assert response.json()["blockhash"] == transaction.blockhash
     assert response.json()["timestamp"] == transaction.timestamp
     assert response.json()["height"] == transaction.height
-    assert response.json()["amount"] == {
-        token: to_satoshi(amount)
-        for token, amount in transaction.amount.items()
-    }
+    assert response.json()["amount"] == transaction.amount
     assert response.json()["txid"] == transaction.txid
 
 
@@ -24,3 +23,55 @@ async def test_not_found(client, block):
     assert response.status_code == 404
 
     assert response.json()["code"] == "transactions:not_found"
+
+
+async def test_inputs(session, transaction, block):
+    outputs = [
+        await helpers.create_output(session, amount=1.0) for _ in range(50)
+    ]
+
+    for output in outputs:
+        await helpers.create_input(session, transaction.txid, output)
+
+    await helpers.create_output(
+        session, txid=transaction.txid, index=0, amount=45.0
+    )
+
+    session.expunge_all()
+
+    with helpers.count_queries(session) as statements:
+        result = await get_transaction_by_txid(session, transaction.txid)
+
+    # Prevouts are loaded in one query regardless of the number of inputs
+    assert len(statements) <= 5
+
+    assert result is not None
+    assert len(result.inputs) == 50
+    assert {input_.address for input_ in result.inputs} == {
+        output.address for output in outputs
+    }
+    assert result.fee == 5 * COIN
+
+
+async def test_legacy_inputs(session, transaction, block):
+    stored = await helpers.create_output(session, amount=2.0)
+    legacy = await helpers.create_output(session, amount=3.0)
+
+    await helpers.create_input(session, transaction.txid, stored)
+    await helpers.create_input(session, transaction.txid, legacy, prevout=False)
+
+    session.expunge_all()
+
+    with helpers.count_queries(session) as statements:
+        result = await get_transaction_by_txid(session, transaction.txid)
+
+    # Only the input without a stored prevout is looked up in outputs
+    assert len([s for s in statements if "service_outputs" in s]) == 2
+
+    assert result is not None
+    assert {input_.address: input_.amount for input_ in result.inputs} == {
+        stored.address: 2 * COIN,
+        legacy.address: 3 * COIN,
+    }
+    assert result.fee == 5 * COIN
+    assert not session.dirty
@@ -1,5 +1,7 @@
+from app.transactions.service import get_transactions
 from tests.client_requests import transactions
-from app.utils import to_satoshi
+from app.constants import COIN
+from tests import helpers
 
 
 async def test_mbc_none(client):
@@ -7,7 +9,12 @@ async def test_mbc_none(client):
     print(response.json())
     assert response.status_code == 200
 
-    assert response.json()["pagination"] == {"total": 0, "pages": 0, "page": 1}
+    assert response.json()["pagination"] == {
+        "total": 0,
+        "pages": 0,
+        "page": 1,
+        "cursor": None,
+    }
     assert response.json()["list"] == []
 
 
@@ -16,12 +23,65 @@ async def test_mbc(client, transaction, block, session):
     print(response.json())
     assert response.status_code == 200
 
-    assert response.json()["pagination"] == {"total": 1, "pages": 1, "page": 1}
+    assert response.json()["pagination"] == {
+        "total": 1,
+        "pages": 1,
+        "page": 1,
+        "cursor": None,
+    }
     transaction_data = response.json()["list"][0]
 
     assert transaction_data["blockhash"] == transaction.blockhash
-    assert transaction_data["amount"] == {
-        token: to_satoshi(amount) for token, amount in transaction.amount.items()
-    }
+    assert transaction_data["amount"] == transaction.amount
     assert transaction_data["height"] == transaction.height
     assert transaction_data["txid"] == transaction.txid
+
+
+async def test_page_queries(session, block):
+    transactions_ = [await helpers.create_transaction(session) for _ in range(10)]
+
+    for transaction in transactions_:
+        output = await helpers.create_output(session, amount=2.0)
+        await helpers.create_input(session, transaction.txid, output)
+        await helpers.create_output(
+            session, txid=transaction.txid, index=0, amount=1.0
+        )
+
+    session.expunge_all()
+
+    with helpers.count_queries(session) as statements:
+        result = await get_transactions(session, "mbc", 0, 10)
+
+    # Outputs, inputs and prevouts are loaded for the whole page at once
+    assert len(statements) <= 5
+
+    assert len(result) == 10
+    for transaction in result:
+        assert len(transaction.inputs) == 1
+        assert len(transaction.outputs) == 1
+        assert transaction.fee == COIN
+
+
+async def test_cursor(client, session, block):
+    created = [
+        await helpers.create_transaction(
+            session, height=index // 4, block_index=index % 4
+        )
+        for index in range(15)
+    ]
+
+    first = await transactions.list_transactions(client, "mbc")
+    cursor = first.json()["pagination"]["cursor"]
+    assert cursor is not None
+
+    second = await transactions.list_transactions(client, "mbc", cursor=cursor)
+    assert second.json()["pagination"]["cursor"] is None
+
+    txids = [
+        transaction["txid"]
+        for response in (first, second)
+        for transaction in response.json()["list"]
+    ]
+
+    # Newest first, by height and position in block
+    assert txids == [transaction.txid for transaction in reversed(created)]